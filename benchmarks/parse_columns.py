@@ -0,0 +1,88 @@
+"""Micro-benchmark of the per-cell and column-wise value parsers.
+
+Run from the repository root after ``pip install -e .``::
+
+    python benchmarks/parse_columns.py --rows 2000 --repeat 5
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import timeit
+from typing import Callable, Iterable, List
+
+from dateutil import parser as date_parser
+
+from portfolio_ingest.sources.utils import (
+    parse_date,
+    parse_date_column,
+    parse_float,
+    parse_float_column,
+    parse_int,
+    parse_int_column,
+)
+
+
+def _legacy_int(value: str | None) -> int | None:
+    """The original per-cell integer parser."""
+
+    if not value:
+        return None
+    cleaned = re.sub(r"[^0-9]", "", value)
+    return int(cleaned) if cleaned else None
+
+
+def _legacy_date(value: str | None):
+    """The original per-cell dateutil parse."""
+
+    return date_parser.parse(value, dayfirst=True).date() if value else None
+
+
+def _columns(rows: int, seed: int) -> dict[str, List[str]]:
+    rng = random.Random(seed)
+    dates = [f"{day} {month} 2024" for day in range(1, 29) for month in ("Mar", "Jun", "Sep")]
+    return {
+        "shares": [f"{rng.randrange(1, 10**7):,}" for _ in range(rows)],
+        "quantity": [
+            rng.choice([f"{rng.randrange(1, 99)}.{rng.randrange(10)} Cr", f"{rng.randrange(1, 99)} L"])
+            for _ in range(rows)
+        ],
+        "percent": [f"{rng.uniform(1, 10):.2f}%" for _ in range(rows)],
+        "date": [rng.choice(dates[:6]) for _ in range(rows)],
+    }
+
+
+def _cells(func: Callable) -> Callable[[Iterable[str]], list]:
+    return lambda values: [func(value) for value in values]
+
+
+def main() -> None:
+    options = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    options.add_argument("--rows", type=int, default=2000, help="Cells per column")
+    options.add_argument("--repeat", type=int, default=5, help="Timed runs per parser")
+    options.add_argument("--seed", type=int, default=7)
+    args = options.parse_args()
+
+    columns = _columns(args.rows, args.seed)
+    cases = [
+        ("shares", "legacy parse_int", _cells(_legacy_int)),
+        ("shares", "parse_int per cell", _cells(parse_int)),
+        ("shares", "parse_int_column", parse_int_column),
+        ("quantity", "parse_int per cell", _cells(parse_int)),
+        ("quantity", "parse_int_column", parse_int_column),
+        ("percent", "parse_float per cell", _cells(parse_float)),
+        ("percent", "parse_float_column", parse_float_column),
+        ("date", "legacy dateutil", _cells(_legacy_date)),
+        ("date", "parse_date per cell", _cells(parse_date)),
+        ("date", "parse_date_column", parse_date_column),
+    ]
+    print(f"{'column':<10} {'parser':<22} {'best ms':>9} {'us/cell':>8}")
+    for column, label, func in cases:
+        values = columns[column]
+        best = min(timeit.repeat(lambda: func(values), number=1, repeat=args.repeat))
+        print(f"{column:<10} {label:<22} {best * 1e3:>9.2f} {best * 1e6 / len(values):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
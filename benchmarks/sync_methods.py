@@ -0,0 +1,102 @@
+"""Benchmark of the database sync methods over synthetic holdings.
+
+Needs a scratch PostgreSQL database: every case truncates ``investors`` and ``stocks``
+(and with them all holdings and deals) before it runs. From the repository root after
+``pip install -e .``::
+
+    python benchmarks/sync_methods.py postgresql+psycopg://localhost/scratch \\
+        --investors 200 --holdings 250
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from typing import List
+
+from sqlalchemy import text
+
+from portfolio_ingest.db import create_db_engine, ensure_schema, sync_holdings
+from portfolio_ingest.models import Holding
+
+
+def _holdings(investors: int, per_investor: int, seed: int) -> List[Holding]:
+    rng = random.Random(seed)
+    tickers = [f"TICK{index:05d}" for index in range(per_investor * 4)]
+    rows = []
+    for investor in range(investors):
+        name = f"Investor {investor:04d}"
+        for ticker in rng.sample(tickers, per_investor):
+            rows.append(
+                Holding(
+                    investor=name,
+                    ticker=ticker,
+                    source_url=f"https://example.com/{investor}",
+                    percent_holding=round(rng.uniform(1, 10), 2),
+                    shares=rng.randrange(1, 10**7),
+                    reported_date=date(2024, 3, 31) - timedelta(days=rng.randrange(3) * 91),
+                )
+            )
+    return rows
+
+
+def _revised(rows: List[Holding], seed: int) -> List[Holding]:
+    """Drop a tenth of the rows and change the values of half of the rest."""
+
+    rng = random.Random(seed)
+    revised = []
+    for row in rows:
+        if rng.random() < 0.1:
+            continue
+        if rng.random() < 0.5:
+            row = Holding(
+                row.investor,
+                row.ticker,
+                row.source_url,
+                row.percent_holding,
+                row.shares + 1,
+                row.reported_date,
+            )
+        revised.append(row)
+    return revised
+
+
+def main() -> None:
+    options = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    options.add_argument("database_url", help="URL of a scratch database")
+    options.add_argument("--investors", type=int, default=200)
+    options.add_argument("--holdings", type=int, default=250, help="Holdings per investor")
+    options.add_argument(
+        "--row-limit",
+        type=int,
+        default=5000,
+        help="Rows used for the one-row-per-statement case, which is far slower",
+    )
+    options.add_argument("--seed", type=int, default=7)
+    args = options.parse_args()
+
+    engine = create_db_engine(args.database_url)
+    ensure_schema(engine)
+    rows = _holdings(args.investors, args.holdings, args.seed)
+    cases = [
+        ("upsert, 1 row per batch", "upsert", 1, rows[: args.row_limit]),
+        ("upsert, 1000 per batch", "upsert", 1000, rows),
+        ("copy", "copy", 1000, rows),
+    ]
+    print(f"{'method':<24} {'rows':>8} {'insert s':>9} {'revise s':>9} {'rows/s':>9}")
+    for label, method, chunk_size, data in cases:
+        with engine.begin() as conn:
+            conn.execute(text("TRUNCATE investors, stocks RESTART IDENTITY CASCADE"))
+        revised = _revised(data, args.seed)
+        timings = []
+        for batch in (data, revised):
+            started = time.perf_counter()
+            sync_holdings(engine, batch, method=method, chunk_size=chunk_size)
+            timings.append(time.perf_counter() - started)
+        rate = (len(data) + len(revised)) / sum(timings)
+        print(f"{label:<24} {len(data):>8} {timings[0]:>9.2f} {timings[1]:>9.2f} {rate:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
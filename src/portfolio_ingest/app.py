@@ -22,9 +22,10 @@ from .db import (
     fetch_holdings_view,
     get_or_create_schedule,
     update_schedule,
+    warm_id_cache,
 )
 from .logging_utils import configure_logging
-from .runner import run_ingestion
+from .runner import run_ingestion_async
 
 configure_logging()
 
@@ -37,12 +38,12 @@ templates = Jinja2Templates(directory=str(Path(__file__).resolve().parent / "tem
 scheduler = AsyncIOScheduler()
 JOB_ID = "daily-ingestion"
 
-def _ingestion_job() -> None:
-    """Wrapper for running the ingestion pipeline within the scheduler."""
+async def _ingestion_job() -> None:
+    """Wrapper for running the ingestion pipeline within the scheduler's event loop."""
 
     LOGGER.info("Running scheduled ingestion job")
     try:
-        run_ingestion(settings)
+        await run_ingestion_async(settings)
     except Exception:  # pragma: no cover - defensive logging
         LOGGER.exception("Scheduled ingestion run failed")
     else:
@@ -98,6 +99,7 @@ app = FastAPI(title="Investor Holdings", default_response_class=HTMLResponse)
 async def startup_event() -> None:
     LOGGER.info("Starting FastAPI application")
     ensure_schema(engine)
+    warm_id_cache(engine, settings.id_cache_size)
     schedule = get_or_create_schedule(engine)
     _configure_job(schedule)
     if not scheduler.running:
@@ -28,6 +28,10 @@ DEFAULT_INVESTOR_SOURCES: Mapping[str, str] = {
 }
 
 
+ARCHIVE_MODES = ("off", "record", "replay")
+SYNC_METHODS = ("upsert", "copy")
+
+
 def _resolve_env_file(candidate: str) -> Path | None:
     """Return the first matching environment file path if it exists."""
 
@@ -113,12 +117,66 @@ def _build_database_url(env: Mapping[str, str]) -> str | None:
     return f"{driver}://{auth}@{host}{port_part}/{database}"
 
 
+def _env_float(env: Mapping[str, str], key: str, default: float) -> float:
+    """Read a non-negative float setting from the environment."""
+
+    raw = env.get(key)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        value = float(raw)
+    except ValueError as exc:
+        raise RuntimeError(f"{key} must be a number, got {raw!r}") from exc
+    if value < 0:
+        raise RuntimeError(f"{key} must not be negative, got {value}")
+    return value
+
+
+def _env_int(env: Mapping[str, str], key: str, default: int, *, minimum: int = 1) -> int:
+    """Read a bounded integer setting from the environment."""
+
+    raw = env.get(key)
+    if raw is None or not raw.strip():
+        return default
+    try:
+        value = int(raw)
+    except ValueError as exc:
+        raise RuntimeError(f"{key} must be an integer, got {raw!r}") from exc
+    if value < minimum:
+        raise RuntimeError(f"{key} must be at least {minimum}, got {value}")
+    return value
+
+
 @dataclass(frozen=True)
 class Settings:
     """Runtime configuration."""
 
     database_url: str
     investor_sources: Mapping[str, str]
+    fetch_workers: int = 8
+    fetch_per_host: int = 4
+    http_pool_connections: int = 4
+    http_pool_maxsize: int = 10
+    cache_dir: str | None = None
+    parse_cache_dir: str | None = None
+    rate_limit: float = 2.0
+    rate_limit_max: float = 8.0
+    http_connect_timeout: float = 10.0
+    http_read_timeout: float = 30.0
+    http_retries: int = 2
+    http_backoff: float = 1.0
+    run_timeout: float = 0.0
+    archive_dir: str | None = None
+    archive_mode: str = "off"
+    archive_run: str = "latest"
+    html_parser: str | None = None
+    parse_workers: int = 0
+    pipeline_buffer: int = 8
+    id_cache_size: int = 100_000
+    upsert_chunk_size: int = 1000
+    sync_method: str = "upsert"
+    # Investors a run is limited to; empty runs every configured investor.
+    selected_investors: tuple[str, ...] = ()
 
     @staticmethod
     def load(env: Mapping[str, str] | None = None) -> "Settings":
@@ -153,7 +211,51 @@ class Settings:
         else:
             investor_sources = dict(DEFAULT_INVESTOR_SOURCES)
 
-        return Settings(database_url=database_url, investor_sources=investor_sources)
+        archive_mode = merged_env.get("PORTFOLIO_INGEST_ARCHIVE_MODE", "off").strip().lower() or "off"
+        if archive_mode not in ARCHIVE_MODES:
+            raise RuntimeError(
+                f"PORTFOLIO_INGEST_ARCHIVE_MODE must be one of {', '.join(ARCHIVE_MODES)}"
+            )
+
+        sync_method = merged_env.get("PORTFOLIO_INGEST_SYNC_METHOD", "upsert").strip().lower() or "upsert"
+        if sync_method not in SYNC_METHODS:
+            raise RuntimeError(
+                f"PORTFOLIO_INGEST_SYNC_METHOD must be one of {', '.join(SYNC_METHODS)}"
+            )
+
+        cache_dir = merged_env.get("PORTFOLIO_INGEST_CACHE_DIR") or None
+
+        return Settings(
+            database_url=database_url,
+            investor_sources=investor_sources,
+            fetch_workers=_env_int(merged_env, "PORTFOLIO_INGEST_FETCH_WORKERS", 8),
+            fetch_per_host=_env_int(merged_env, "PORTFOLIO_INGEST_FETCH_PER_HOST", 4),
+            http_pool_connections=_env_int(merged_env, "PORTFOLIO_INGEST_HTTP_POOL_CONNECTIONS", 4),
+            http_pool_maxsize=_env_int(merged_env, "PORTFOLIO_INGEST_HTTP_POOL_MAXSIZE", 10),
+            cache_dir=cache_dir,
+            parse_cache_dir=merged_env.get("PORTFOLIO_INGEST_PARSE_CACHE_DIR")
+            or (str(Path(cache_dir) / "parsed") if cache_dir else None),
+            rate_limit=_env_float(merged_env, "PORTFOLIO_INGEST_RATE_LIMIT", 2.0),
+            rate_limit_max=_env_float(merged_env, "PORTFOLIO_INGEST_RATE_LIMIT_MAX", 8.0),
+            http_connect_timeout=_env_float(merged_env, "PORTFOLIO_INGEST_HTTP_CONNECT_TIMEOUT", 10.0),
+            http_read_timeout=_env_float(merged_env, "PORTFOLIO_INGEST_HTTP_READ_TIMEOUT", 30.0),
+            http_retries=_env_int(merged_env, "PORTFOLIO_INGEST_HTTP_RETRIES", 2, minimum=0),
+            http_backoff=_env_float(merged_env, "PORTFOLIO_INGEST_HTTP_BACKOFF", 1.0),
+            run_timeout=_env_float(merged_env, "PORTFOLIO_INGEST_RUN_TIMEOUT", 0.0),
+            archive_dir=merged_env.get("PORTFOLIO_INGEST_ARCHIVE_DIR") or None,
+            archive_mode=archive_mode,
+            archive_run=merged_env.get("PORTFOLIO_INGEST_ARCHIVE_RUN") or "latest",
+            html_parser=merged_env.get("PORTFOLIO_INGEST_HTML_PARSER") or None,
+            parse_workers=_env_int(
+                merged_env, "PORTFOLIO_INGEST_PARSE_WORKERS", 0, minimum=0
+            ),
+            pipeline_buffer=_env_int(merged_env, "PORTFOLIO_INGEST_PIPELINE_BUFFER", 8),
+            id_cache_size=_env_int(
+                merged_env, "PORTFOLIO_INGEST_ID_CACHE_SIZE", 100_000, minimum=0
+            ),
+            upsert_chunk_size=_env_int(merged_env, "PORTFOLIO_INGEST_UPSERT_CHUNK_SIZE", 1000),
+            sync_method=sync_method,
+        )
 
 
 __all__ = ["Settings", "DEFAULT_INVESTOR_SOURCES"]
@@ -1,12 +1,18 @@
 """Database integration utilities."""
 from __future__ import annotations
 
+import hashlib
+import json
 import logging
+import threading
+from collections import OrderedDict
 from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import Iterable, Iterator
+from typing import Callable, Collection, Iterable, Iterator, Mapping, TypeVar
 
 from sqlalchemy import (
+    Boolean,
     Column,
     Date,
     DateTime,
@@ -17,12 +23,27 @@ from sqlalchemy import (
     String,
     Table,
     UniqueConstraint,
+    any_,
+    bindparam,
+    cast,
     create_engine,
     delete,
+    exists,
+    func,
+    insert,
+    inspect,
+    literal,
+    literal_column,
+    or_,
     select,
+    text,
+    union,
+    update,
 )
-from sqlalchemy.dialects.postgresql import insert as pg_insert
-from sqlalchemy.engine import Engine
+from sqlalchemy.dialects.postgresql import ARRAY, insert as pg_insert
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.sql import column as sql_column, table as sql_table
 
 from .models import Deal, Holding
 
@@ -37,6 +58,8 @@ investors = Table(
     Column("id", Integer, primary_key=True, autoincrement=True),
     Column("name", String(255), nullable=False, unique=True),
     Column("source_url", String(1024), nullable=False),
+    # Fingerprint of the holdings and deals last synchronized for the investor.
+    Column("content_hash", String(64), nullable=True),
     Column("created_at", DateTime, nullable=False, default=datetime.utcnow),
     Column(
         "updated_at", DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow
@@ -113,14 +136,81 @@ ingest_schedule = Table(
 )
 
 
+# Per-run staging tables, created by begin_sync() on the run's own connection. Rows are
+# keyed by investor name and ticker, so staging them locks nothing in the tables above.
+_run_metadata = MetaData()
+
+_run_investors = Table(
+    "run_investors",
+    _run_metadata,
+    Column("name", String(255), primary_key=True),
+    Column("content_hash", String(64), nullable=False),
+    prefixes=["TEMPORARY"],
+)
+
+_run_holdings = Table(
+    "run_holdings",
+    _run_metadata,
+    Column("investor", String(255), nullable=False),
+    Column("source_url", String(1024), nullable=False),
+    Column("ticker", String(64), nullable=False),
+    Column("percent_holding", Float, nullable=True),
+    Column("shares", Integer, nullable=True),
+    Column("reported_date", Date, nullable=True),
+    prefixes=["TEMPORARY"],
+)
+
+_run_deals = Table(
+    "run_deals",
+    _run_metadata,
+    Column("investor", String(255), nullable=False),
+    Column("source_url", String(1024), nullable=False),
+    Column("ticker", String(64), nullable=False),
+    Column("deal_type", String(16), nullable=False),
+    Column("deal_date", Date, nullable=False),
+    Column("quantity", Integer, nullable=True),
+    Column("price", Float, nullable=True),
+    prefixes=["TEMPORARY"],
+)
+
+
 DEFAULT_SCHEDULE = {"hour": 2, "minute": 0, "timezone": "UTC"}
 
 
 UNIQUE_CONSTRAINTS: dict[str, str] = {
+    "holdings": "uq_holdings_investor_stock",
     "bulk_deals": "uq_bulk_deal",
     "block_deals": "uq_block_deal",
 }
 
+# Columns identifying a scraped row; rows whose key disappears from a page are removed.
+NATURAL_KEYS: dict[str, tuple[str, ...]] = {
+    "holdings": ("investor_id", "stock_id"),
+    "bulk_deals": ("investor_id", "stock_id", "deal_date"),
+    "block_deals": ("investor_id", "stock_id", "deal_date"),
+}
+
+# Scraped columns written besides the natural key, named as on the model.
+VALUE_COLUMNS: dict[str, tuple[str, ...]] = {
+    "holdings": ("percent_holding", "shares", "reported_date"),
+    "bulk_deals": ("quantity", "price"),
+    "block_deals": ("quantity", "price"),
+}
+
+# Bump when the way scraped rows are written changes, so every investor is rewritten.
+FINGERPRINT_VERSION = 1
+
+DEFAULT_ID_CACHE_SIZE = 100_000
+
+# SQLSTATE raised when a write references an investor or stock id that does not exist.
+FOREIGN_KEY_VIOLATION = "23503"
+
+# Rows sent per executemany batch of the upsert method.
+UPSERT_CHUNK_SIZE = 1000
+
+# Stale rows removed per DELETE statement.
+DELETE_CHUNK_SIZE = 5000
+
 
 def create_db_engine(database_url: str) -> Engine:
     """Create a SQLAlchemy engine."""
@@ -142,127 +232,1001 @@ def ensure_schema(engine: Engine) -> None:
 
     LOGGER.debug("Ensuring database schema is present")
     metadata.create_all(engine)
+    # create_all() never alters existing tables; add columns introduced later. ALTER
+    # TABLE locks the table exclusively even when the column exists, and would queue
+    # behind a running ingestion, so look first.
+    columns = {column["name"] for column in inspect(engine).get_columns("investors")}
+    if "content_hash" not in columns:
+        with session(engine) as conn:
+            conn.execute(
+                text("ALTER TABLE investors ADD COLUMN IF NOT EXISTS content_hash VARCHAR(64)")
+            )
+
+
+class IdCache:
+    """Bounded LRU map from investor names and tickers to their database ids.
+
+    Entries are ``(id, source_url)`` for investors and ``(id, None)`` for stocks. Cached
+    ids are used without asking the database. A row deleted, or an insert rolled back,
+    after its id was cached surfaces as a foreign key violation or, when a staged run is
+    applied, as a name or ticker with no row; both evict the affected entries and resolve
+    them again (see :func:`_with_fresh_ids` and :func:`_apply_run`).
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_ID_CACHE_SIZE) -> None:
+        self.maxsize = maxsize
+        self.warmed = False
+        self._entries: OrderedDict[tuple[str, str], tuple[int, str | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, table: str, keys: Iterable[str]) -> dict[str, tuple[int, str | None]]:
+        found: dict[str, tuple[int, str | None]] = {}
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get((table, key))
+                if entry is not None:
+                    self._entries.move_to_end((table, key))
+                    found[key] = entry
+        return found
+
+    def store(self, table: str, entries: Mapping[str, tuple[int, str | None]]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            for key, entry in entries.items():
+                self._entries[(table, key)] = entry
+                self._entries.move_to_end((table, key))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def discard(self, table: str, keys: Iterable[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._entries.pop((table, key), None)
+
+    def resize(self, maxsize: int) -> None:
+        with self._lock:
+            self.maxsize = maxsize
+            while len(self._entries) > max(maxsize, 0):
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.warmed = False
+
+
+_ID_CACHES: dict[str, IdCache] = {}
+_ID_CACHES_LOCK = threading.Lock()
+
+
+def id_cache(engine: Engine) -> IdCache:
+    """Return the process-wide id cache of the database behind ``engine``.
+
+    Caches are keyed by database URL, so engines created for each ingestion run
+    share the ids resolved by earlier runs. The password is masked in the key so it is
+    not kept in memory beyond the engine itself.
+    """
+
+    key = engine.url.render_as_string(hide_password=True)
+    with _ID_CACHES_LOCK:
+        cache = _ID_CACHES.get(key)
+        if cache is None:
+            cache = _ID_CACHES[key] = IdCache()
+        return cache
+
+
+def warm_id_cache(engine: Engine, maxsize: int = DEFAULT_ID_CACHE_SIZE) -> IdCache:
+    """Size the id cache of ``engine`` and load existing investors and stocks into it.
+
+    Only the first call per database reads the tables; later calls just apply
+    ``maxsize``. A ``maxsize`` of ``0`` disables the cache.
+    """
+
+    cache = id_cache(engine)
+    cache.resize(maxsize)
+    if cache.warmed or maxsize <= 0:
+        return cache
+    with session(engine) as conn:
+        rows = conn.execute(
+            select(investors.c.name, investors.c.id, investors.c.source_url).limit(maxsize)
+        ).all()
+        cache.store("investors", {name: (id_, url) for name, id_, url in rows})
+        remaining = maxsize - len(rows)
+        if remaining > 0:
+            # Newest tickers first; they are the most likely to appear in fresh pages.
+            stmt = select(stocks.c.ticker, stocks.c.id).order_by(stocks.c.id.desc())
+            tickers = conn.execute(stmt.limit(remaining)).all()
+            cache.store("stocks", {ticker: (id_, None) for ticker, id_ in reversed(tickers)})
+    cache.warmed = True
+    LOGGER.debug("Warmed id cache with %d entries", len(cache))
+    return cache
+
+
+def _upsert_investors(conn, rows: Iterable[Holding | Deal]) -> dict[str, int]:
+    """Resolve the investors referenced by ``rows`` to ids; return name to id.
+
+    Investors cached with the same source URL are reused without a query; the rest are
+    upserted in one statement.
+    """
+
+    # ON CONFLICT DO UPDATE may touch a row only once per statement, so dedupe first.
+    source_urls = {row.investor: row.source_url for row in rows}
+    if not source_urls:
+        return {}
+    cache = id_cache(conn.engine)
+    cached = cache.lookup("investors", source_urls)
+    ids = {name: entry[0] for name, entry in cached.items() if entry[1] == source_urls[name]}
+    missing = {name: url for name, url in source_urls.items() if name not in ids}
+    if missing:
+        # Sorted so concurrent runs lock overlapping rows in the same order.
+        stmt = pg_insert(investors).values(
+            [{"name": name, "source_url": missing[name]} for name in sorted(missing)]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[investors.c.name],
+            set_={"source_url": stmt.excluded.source_url, "updated_at": datetime.utcnow()},
+            where=investors.c.source_url.is_distinct_from(stmt.excluded.source_url),
+        ).returning(investors.c.name, investors.c.id)
+        resolved = dict(conn.execute(stmt).tuples().all())
+        # The guard returns no row for investors stored with the same URL.
+        existing = missing.keys() - resolved.keys()
+        if existing:
+            stmt = select(investors.c.name, investors.c.id).where(investors.c.name.in_(existing))
+            resolved.update(conn.execute(stmt).tuples().all())
+        cache.store("investors", {name: (id_, missing[name]) for name, id_ in resolved.items()})
+        ids.update(resolved)
+    return ids
+
+
+def _upsert_stocks(conn, tickers: Iterable[str]) -> dict[str, int]:
+    """Resolve ``tickers`` to ids, inserting the uncached ones in one statement."""
+
+    wanted = set(tickers)
+    if not wanted:
+        return {}
+    cache = id_cache(conn.engine)
+    ids = {ticker: entry[0] for ticker, entry in cache.lookup("stocks", wanted).items()}
+    missing = wanted.difference(ids)
+    if missing:
+        # Sorted so concurrent runs lock overlapping rows in the same order.
+        stmt = pg_insert(stocks).values([{"ticker": ticker} for ticker in sorted(missing)])
+        stmt = stmt.on_conflict_do_nothing().returning(stocks.c.ticker, stocks.c.id)
+        inserted = dict(conn.execute(stmt).tuples().all())
+        # DO NOTHING returns no row for tickers that already existed.
+        existing = missing.difference(inserted)
+        if existing:
+            stmt = select(stocks.c.ticker, stocks.c.id).where(stocks.c.ticker.in_(existing))
+            inserted.update(conn.execute(stmt).tuples().all())
+        cache.store("stocks", {ticker: (id_, None) for ticker, id_ in inserted.items()})
+        ids.update(inserted)
+    return ids
+
 
+_T = TypeVar("_T")
 
-def _upsert_investor(conn, name: str, source_url: str) -> int:
-    stmt = pg_insert(investors).values(name=name, source_url=source_url)
+
+def _with_fresh_ids(
+    engine: Engine, rows: Collection[Holding | Deal], write: Callable[[Connection], _T]
+) -> _T:
+    """Run ``write`` in a transaction, retrying once if a cached id of ``rows`` is stale.
+
+    The cache is trusted without a lookup, so a row deleted or rolled back after its id
+    was cached makes the write fail with a foreign key violation. The whole transaction
+    is then rolled back, the investors and tickers of ``rows`` are evicted and ``write``
+    runs again with ids read from the database.
+    """
+
+    try:
+        with session(engine) as conn:
+            return write(conn)
+    except IntegrityError as exc:
+        if getattr(exc.orig, "sqlstate", None) != FOREIGN_KEY_VIOLATION:
+            raise
+        LOGGER.info("Cached investor or stock ids are stale; resolving them again")
+    cache = id_cache(engine)
+    cache.discard("investors", {row.investor for row in rows})
+    cache.discard("stocks", {row.ticker for row in rows})
+    with session(engine) as conn:
+        return write(conn)
+
+
+def _resolve_ids(
+    conn, rows: Iterable[Holding | Deal]
+) -> tuple[dict[str, int], dict[str, int]]:
+    """Resolve the investors and tickers of ``rows`` at once."""
+
+    rows = list(rows)
+    return _upsert_investors(conn, rows), _upsert_stocks(conn, (row.ticker for row in rows))
+
+
+def _group_holdings(
+    holdings_data: Iterable[Holding], ids: tuple[dict[str, int], dict[str, int]]
+) -> dict[tuple[int, int], Holding]:
+    investor_ids, stock_ids = ids
+    grouped: dict[tuple[int, int], Holding] = {}
+    for holding in holdings_data:
+        grouped[(investor_ids[holding.investor], stock_ids[holding.ticker])] = holding
+    return grouped
+
+
+def _group_deals(
+    deals_data: Iterable[Deal], ids: tuple[dict[str, int], dict[str, int]]
+) -> dict[tuple[int, int, date], Deal]:
+    investor_ids, stock_ids = ids
+    grouped: dict[tuple[int, int, date], Deal] = {}
+    for deal in deals_data:
+        key = (investor_ids[deal.investor], stock_ids[deal.ticker], deal.deal_date)
+        grouped[key] = deal
+    return grouped
+
+
+@dataclass(slots=True)
+class SyncResult:
+    """Row counts of a table sync."""
+
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    deleted: int = 0
+
+    def add(self, other: SyncResult) -> None:
+        self.inserted += other.inserted
+        self.updated += other.updated
+        self.unchanged += other.unchanged
+        self.deleted += other.deleted
+
+
+def _merge(conn, table: Table, source, params: Mapping[str, object] | None = None) -> SyncResult:
+    """Upsert the rows ``source`` selects into ``table`` and count what happened.
+
+    ``source`` yields the natural key and value columns. Rows whose values are not
+    distinct from the stored ones are left alone, so they leave no dead tuple behind
+    and keep their ``updated_at``; ``xmax = 0`` tells inserted rows from updated ones.
+    """
+
+    keys = NATURAL_KEYS[table.name]
+    values = VALUE_COLUMNS[table.name]
+    now = literal(datetime.utcnow(), DateTime)
+    stmt = pg_insert(table).from_select(
+        [*keys, *values, "created_at", "updated_at"], select(*source.c, now, now)
+    )
     stmt = stmt.on_conflict_do_update(
-        index_elements=[investors.c.name],
-        set_={"source_url": stmt.excluded.source_url, "updated_at": datetime.utcnow()},
-    ).returning(investors.c.id)
-    return conn.execute(stmt).scalar_one()
+        constraint=UNIQUE_CONSTRAINTS[table.name],
+        set_={column: stmt.excluded[column] for column in (*values, "updated_at")},
+        where=or_(*(table.c[column].is_distinct_from(stmt.excluded[column]) for column in values)),
+    )
+    written = stmt.returning(literal_column("xmax = 0", Boolean).label("inserted")).cte()
+    counts = select(
+        func.count().filter(written.c.inserted), func.count().filter(~written.c.inserted)
+    )
+    inserted, updated = conn.execute(counts, params or {}).one()
+    return SyncResult(inserted=inserted, updated=updated)
+
+
+def _unnest(table: Table, columns: tuple[str, ...]):
+    """Return ``unnest()`` over one array bind parameter per column, named after it.
+
+    Rows sent this way cost one parameter per column however many there are, and the
+    statement compiles once.
+    """
+
+    arrays = [
+        cast(bindparam(column, type_=ARRAY(table.c[column].type)), ARRAY(table.c[column].type))
+        for column in columns
+    ]
+    return func.unnest(*arrays).table_valued(*columns).render_derived()
+
+
+def _upsert_rows(
+    conn, table: Table, grouped: dict[tuple, Holding | Deal], chunk_size: int = UPSERT_CHUNK_SIZE
+) -> SyncResult:
+    """Upsert ``grouped`` into ``table``, ``chunk_size`` rows per statement.
+
+    Each chunk travels as one array per column, see :func:`_unnest`.
+    """
+
+    columns = NATURAL_KEYS[table.name] + VALUE_COLUMNS[table.name]
+    values = VALUE_COLUMNS[table.name]
+    source = _unnest(table, columns)
+    rows = [(*key, *(getattr(row, column) for column in values)) for key, row in grouped.items()]
+    result = SyncResult()
+    size = max(chunk_size, 1)
+    for start in range(0, len(rows), size):
+        cells = zip(*rows[start : start + size])
+        result.add(_merge(conn, table, source, dict(zip(columns, map(list, cells)))))
+    return result
+
+
+def _temp_table(conn, table: Table, prefix: str, columns: tuple[str, ...]):
+    """Create (once per connection) and empty a temporary copy of ``table``'s ``columns``.
+
+    The table is emptied again at commit. Returns a lightweight table construct for it.
+    """
+
+    name = f"{prefix}_{table.name}"
+    conn.exec_driver_sql(
+        f"CREATE TEMPORARY TABLE IF NOT EXISTS {name} ON COMMIT DELETE ROWS AS "
+        f"SELECT {', '.join(columns)} FROM {table.name} WITH NO DATA"
+    )
+    conn.exec_driver_sql(f"TRUNCATE {name}")
+    return sql_table(name, *(sql_column(column) for column in columns))
+
+
+def _delete_in_chunks(conn, table: Table, stale, chunk_size: int = DELETE_CHUNK_SIZE) -> int:
+    """Delete the rows whose ids ``stale`` selects, at most ``chunk_size`` per statement."""
+
+    stmt = delete(table).where(table.c.id.in_(stale.limit(chunk_size).scalar_subquery()))
+    removed = 0
+    while True:
+        deleted = conn.execute(stmt).rowcount
+        removed += deleted
+        if deleted < chunk_size:
+            return removed
+
+
+def _delete_unstaged(
+    conn,
+    table: Table,
+    staged,
+    investor_ids: Collection[int],
+    chunk_size: int = DELETE_CHUNK_SIZE,
+) -> int:
+    """Delete rows of ``investor_ids`` whose natural key is missing from ``staged``.
+
+    The anti-join runs in the database, ``chunk_size`` rows per statement, so neither
+    the table's keys nor the ids to remove travel to Python.
+    """
+
+    if not investor_ids:
+        return 0
+    keys = NATURAL_KEYS[table.name]
+    ids = bindparam("investor_ids", list(investor_ids), type_=ARRAY(Integer))
+    stale = select(table.c.id).where(
+        table.c.investor_id == any_(ids),
+        ~exists().where(*(staged.c[column] == table.c[column] for column in keys)),
+    )
+    return _delete_in_chunks(conn, table, stale, chunk_size)
+
+
+def _delete_missing(
+    conn, table: Table, keep: Collection[tuple], investor_ids: Collection[int]
+) -> int:
+    """Delete rows of ``investor_ids`` in ``table`` whose natural key is not in ``keep``.
+
+    The kept keys are sent once (see :func:`_unnest`) into a temporary table that
+    :func:`_delete_unstaged` anti-joins against.
+    """
+
+    if not investor_ids:
+        return 0
+    keys = NATURAL_KEYS[table.name]
+    staged = _temp_table(conn, table, "keep", keys)
+    if keep:
+        stmt = insert(staged).from_select(keys, select(*_unnest(table, keys).c))
+        conn.execute(stmt, dict(zip(keys, map(list, zip(*keep)))))
+    return _delete_unstaged(conn, table, staged, investor_ids)
+
+
+def _copy_rows(conn, name: str, columns: tuple[str, ...], rows: Iterable[tuple]) -> None:
+    """Load ``rows`` into table ``name`` with ``COPY ... FROM STDIN``."""
+
+    if conn.dialect.driver != "psycopg":
+        raise RuntimeError("The copy sync method requires the psycopg driver")
+    cursor = conn.connection.driver_connection.cursor()
+    with cursor, cursor.copy(f"COPY {name} ({', '.join(columns)}) FROM STDIN") as copy:
+        for row in rows:
+            copy.write_row(row)
+
+
+def _stage(conn, table: Table, grouped: dict[tuple, Holding | Deal]):
+    """COPY ``grouped`` into a temporary table shaped like ``table``'s scraped columns."""
+
+    columns = NATURAL_KEYS[table.name] + VALUE_COLUMNS[table.name]
+    stage = _temp_table(conn, table, "stage", columns)
+    values = VALUE_COLUMNS[table.name]
+    rows = ((*key, *(getattr(row, column) for column in values)) for key, row in grouped.items())
+    _copy_rows(conn, stage.name, columns, rows)
+    return stage
+
 
+def _copy_sync(
+    conn, table: Table, grouped: dict[tuple, Holding | Deal], investor_ids: Collection[int]
+) -> SyncResult:
+    """Reconcile ``table`` with ``grouped`` through a COPY-loaded staging table.
 
-def _upsert_stock(conn, ticker: str) -> int:
-    stmt = pg_insert(stocks).values(ticker=ticker)
-    stmt = stmt.on_conflict_do_nothing().returning(stocks.c.id)
-    result = conn.execute(stmt).scalar_one_or_none()
-    if result is not None:
+    One ``INSERT ... SELECT ... ON CONFLICT`` merges the staged rows and anti-join
+    ``DELETE`` statements remove the rows of ``investor_ids`` whose key was not staged.
+    """
+
+    if not investor_ids:
+        return SyncResult()
+    stage = _stage(conn, table, grouped)
+    result = _merge(conn, table, stage)
+    result.deleted = _delete_unstaged(conn, table, stage, investor_ids)
+    return result
+
+
+def _sync_table(
+    conn,
+    table: Table,
+    grouped: dict[tuple, Holding | Deal],
+    investor_ids: Collection[int],
+    *,
+    method: str = "upsert",
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+) -> SyncResult:
+    """Write ``grouped`` to ``table``, remove stale rows and count the changes.
+
+    ``method`` is ``upsert`` (chunked ``INSERT ... ON CONFLICT``) or ``copy`` (COPY into
+    a staging table, then set-based merge and delete). Only rows of ``investor_ids``
+    are removed.
+    """
+
+    if method == "copy":
+        result = _copy_sync(conn, table, grouped, investor_ids)
+    elif method == "upsert":
+        result = _upsert_rows(conn, table, grouped, chunk_size)
+        result.deleted = _delete_missing(conn, table, grouped.keys(), investor_ids)
+    else:
+        raise ValueError(f"Unknown sync method {method!r}; expected 'upsert' or 'copy'")
+    result.unchanged = len(grouped) - result.inserted - result.updated
+    return result
+
+
+def _buy_deals(deals_data: Iterable[Deal], deal_type: str) -> list[Deal]:
+    return [
+        deal
+        for deal in deals_data
+        if deal.deal_type.lower() == deal_type and deal.side.lower() == "buy"
+    ]
+
+
+def content_fingerprint(holdings_data: Iterable[Holding], deals_data: Iterable[Deal]) -> str:
+    """Return a stable hash of one investor's scraped holdings and deals."""
+
+    def rows(values: Iterable[list]) -> list[str]:
+        # Rows may contain None, so order their serialized form rather than the values.
+        return sorted(json.dumps(value, default=str) for value in values)
+
+    payload = {
+        "version": FINGERPRINT_VERSION,
+        "holdings": rows(
+            [h.ticker, h.source_url, h.percent_holding, h.shares, h.reported_date]
+            for h in holdings_data
+        ),
+        "deals": rows(
+            [d.ticker, d.source_url, d.deal_date, d.quantity, d.price, d.deal_type, d.side]
+            for d in deals_data
+        ),
+    }
+    encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _row_counts(
+    holdings_data: Iterable[Holding], deals_data: Iterable[Deal]
+) -> tuple[int, int, int]:
+    """Return how many holdings, bulk deal and block deal rows a sync would leave."""
+
+    deals_data = list(deals_data)
+    return (
+        len({holding.ticker for holding in holdings_data}),
+        *(
+            len({(deal.ticker, deal.deal_date) for deal in _buy_deals(deals_data, kind)})
+            for kind in ("bulk", "block")
+        ),
+    )
+
+
+def _stored_row_counts(conn, investor_ids: Collection[int]) -> dict[int, tuple[int, int, int]]:
+    """Return the holdings, bulk deal and block deal rows stored for each investor."""
+
+    def count(table: Table):
+        return (
+            select(func.count())
+            .where(table.c.investor_id == investors.c.id)
+            .scalar_subquery()
+        )
+
+    stmt = select(
+        investors.c.id, count(holdings), count(bulk_deals), count(block_deals)
+    ).where(investors.c.id.in_(investor_ids))
+    return {row[0]: tuple(row[1:]) for row in conn.execute(stmt)}
+
+
+def _clear_fingerprints(conn, investor_ids: Collection[int]) -> None:
+    """Forget fingerprints so the next streamed sync rewrites those investors."""
+
+    if investor_ids:
+        stmt = update(investors).where(
+            investors.c.id.in_(investor_ids), investors.c.content_hash.is_not(None)
+        )
+        conn.execute(stmt.values(content_hash=None))
+
+
+def _investor_ids(conn, names: Collection[str]) -> dict[str, int]:
+    """Return the ids of the named investors that exist in the database."""
+
+    if not names:
+        return {}
+    stmt = select(investors.c.name, investors.c.id).where(investors.c.name.in_(names))
+    return dict(conn.execute(stmt).tuples().all())
+
+
+def _scope(conn, grouped: dict[tuple, Holding | Deal], names: Iterable[str]) -> set[int]:
+    """Return the investor ids whose rows ``grouped`` replaces: its own plus ``names``."""
+
+    return {key[0] for key in grouped} | set(_investor_ids(conn, set(names)).values())
+
+
+def _log_result(name: str, result: SyncResult) -> None:
+    LOGGER.info(
+        "Synchronized %s: %d inserted, %d updated, %d unchanged, %d deleted",
+        name,
+        result.inserted,
+        result.updated,
+        result.unchanged,
+        result.deleted,
+    )
+
+
+def sync_holdings(
+    engine: Engine,
+    holdings_data: Iterable[Holding],
+    *,
+    investor_names: Iterable[str] = (),
+    method: str = "upsert",
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+) -> SyncResult:
+    """Synchronize holdings table with the scraped data.
+
+    Holdings are replaced only for the investors present in ``holdings_data`` or
+    named in ``investor_names`` (those fetched without any holdings); other investors
+    are left untouched. With the ``upsert`` method rows are upserted ``chunk_size`` at
+    a time; ``copy`` bulk loads them into a staging table and merges it with
+    set-based statements. Returns the row counts, which are also logged.
+    """
+
+    holdings_data = list(holdings_data)
+    investor_names = list(investor_names)
+
+    def write(conn) -> SyncResult:
+        grouped = _group_holdings(holdings_data, _resolve_ids(conn, holdings_data))
+        scope = _scope(conn, grouped, investor_names)
+        result = _sync_table(conn, holdings, grouped, scope, method=method, chunk_size=chunk_size)
+        _clear_fingerprints(conn, scope)
         return result
-    stmt = select(stocks.c.id).where(stocks.c.ticker == ticker)
-    return conn.execute(stmt).scalar_one()
 
+    result = _with_fresh_ids(engine, holdings_data, write)
+    _log_result(holdings.name, result)
+    return result
 
-def sync_holdings(engine: Engine, holdings_data: Iterable[Holding]) -> None:
-    """Synchronize holdings table with the scraped data."""
 
-    grouped: dict[tuple[int, int], Holding] = {}
-    with session(engine) as conn:
-        for holding in holdings_data:
-            investor_id = _upsert_investor(conn, holding.investor, holding.source_url)
-            stock_id = _upsert_stock(conn, holding.ticker)
-            key = (investor_id, stock_id)
-            grouped[key] = holding
-
-        for (investor_id, stock_id), holding in grouped.items():
-            stmt = pg_insert(holdings).values(
-                investor_id=investor_id,
-                stock_id=stock_id,
-                percent_holding=holding.percent_holding,
-                shares=holding.shares,
-                reported_date=holding.reported_date,
-            )
-            stmt = stmt.on_conflict_do_update(
-                constraint="uq_holdings_investor_stock",
-                set_={
-                    "percent_holding": stmt.excluded.percent_holding,
-                    "shares": stmt.excluded.shares,
-                    "reported_date": stmt.excluded.reported_date,
-                    "updated_at": datetime.utcnow(),
-                },
+def _sync_deals(
+    engine: Engine,
+    deals_data: Iterable[Deal],
+    table: Table,
+    investor_names: Iterable[str] = (),
+    method: str = "upsert",
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+) -> SyncResult:
+    deals_data = list(deals_data)
+    investor_names = list(investor_names)
+
+    def write(conn) -> SyncResult:
+        grouped = _group_deals(deals_data, _resolve_ids(conn, deals_data))
+        scope = _scope(conn, grouped, investor_names)
+        result = _sync_table(conn, table, grouped, scope, method=method, chunk_size=chunk_size)
+        _clear_fingerprints(conn, scope)
+        return result
+
+    result = _with_fresh_ids(engine, deals_data, write)
+    _log_result(table.name, result)
+    return result
+
+
+def sync_bulk_deals(
+    engine: Engine,
+    deals_data: Iterable[Deal],
+    *,
+    investor_names: Iterable[str] = (),
+    method: str = "upsert",
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+) -> SyncResult:
+    """Synchronize bulk deals, keeping only buy transactions.
+
+    As with :func:`sync_holdings`, only the listed investors' deals are replaced.
+    """
+
+    deals_data = list(deals_data)
+    investor_names = {*investor_names, *(deal.investor for deal in deals_data)}
+    return _sync_deals(
+        engine, _buy_deals(deals_data, "bulk"), bulk_deals, investor_names, method, chunk_size
+    )
+
+
+def sync_block_deals(
+    engine: Engine,
+    deals_data: Iterable[Deal],
+    *,
+    investor_names: Iterable[str] = (),
+    method: str = "upsert",
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+) -> SyncResult:
+    """Synchronize block deals, keeping only buy transactions.
+
+    As with :func:`sync_holdings`, only the listed investors' deals are replaced.
+    """
+
+    deals_data = list(deals_data)
+    investor_names = {*investor_names, *(deal.investor for deal in deals_data)}
+    return _sync_deals(
+        engine, _buy_deals(deals_data, "block"), block_deals, investor_names, method, chunk_size
+    )
+
+
+@dataclass(slots=True)
+class SyncState:
+    """Running totals of a streamed sync.
+
+    A state from :func:`begin_sync` also carries the run's staging connection; batches
+    are staged through it and applied together by :func:`finish_sync`. A plain
+    ``SyncState()`` writes and commits each batch on its own.
+    """
+
+    investors: int = 0
+    unchanged: int = 0
+    results: dict[str, SyncResult] = field(
+        default_factory=lambda: {name: SyncResult() for name in NATURAL_KEYS}
+    )
+    conn: Connection | None = None
+
+
+def begin_sync(engine: Engine) -> SyncState:
+    """Open the unit of work of an ingestion run.
+
+    Batches synced with the returned state go to temporary staging tables on a
+    connection of the run's own, each in a short transaction of its own that locks
+    nothing readers or other runs use. :func:`finish_sync` then applies the whole run
+    in one short transaction; :func:`abort_sync` discards it.
+    """
+
+    conn = engine.connect()
+    try:
+        with conn.begin():
+            # A pooled connection may still hold the tables of a run that failed.
+            _run_metadata.drop_all(conn)
+            _run_metadata.create_all(conn)
+    except BaseException:
+        conn.close()
+        raise
+    return SyncState(conn=conn)
+
+
+def abort_sync(state: SyncState) -> None:
+    """Discard everything staged through ``state`` since :func:`begin_sync`."""
+
+    if state.conn is not None:
+        conn, state.conn = state.conn, None
+        # Dropping the database session drops its staging tables with it.
+        conn.invalidate()
+        conn.close()
+
+
+@contextmanager
+def sync_run(engine: Engine) -> Iterator[SyncState]:
+    """Run-level unit of work: apply the run on success, discard it if the block raises."""
+
+    state = begin_sync(engine)
+    try:
+        yield state
+    except BaseException:
+        abort_sync(state)
+        raise
+    finish_sync(state)
+
+
+def _stage_rows(conn, table: Table, rows: list[tuple], *, method: str, chunk_size: int) -> None:
+    """Append ``rows``, in ``table``'s column order, to a run staging table."""
+
+    columns = tuple(table.c.keys())
+    if method not in ("upsert", "copy"):
+        raise ValueError(f"Unknown sync method {method!r}; expected 'upsert' or 'copy'")
+    if not rows:
+        return
+    if method == "copy":
+        _copy_rows(conn, table.name, columns, rows)
+        return
+    stmt = insert(table).from_select(columns, select(*_unnest(table, columns).c))
+    size = max(chunk_size, 1)
+    for start in range(0, len(rows), size):
+        cells = zip(*rows[start : start + size])
+        conn.execute(stmt, dict(zip(columns, map(list, cells))))
+
+
+def _stage_batch(
+    conn,
+    holdings_data: list[Holding],
+    deals_data: list[Deal],
+    fingerprints: Mapping[str, str],
+    *,
+    method: str,
+    chunk_size: int,
+) -> None:
+    """Stage the changed investors of a batch, replacing anything staged for them before.
+
+    Rows are deduplicated by natural key as in :func:`_group_holdings` and
+    :func:`_group_deals`, and only buy deals are kept.
+    """
+
+    names = list(fingerprints)
+    for table, column in (
+        (_run_investors, _run_investors.c.name),
+        (_run_holdings, _run_holdings.c.investor),
+        (_run_deals, _run_deals.c.investor),
+    ):
+        conn.execute(delete(table).where(column.in_(names)))
+    held = {(holding.investor, holding.ticker): holding for holding in holdings_data}
+    buys = [*_buy_deals(deals_data, "bulk"), *_buy_deals(deals_data, "block")]
+    dealt = {(deal.investor, deal.ticker, deal.deal_type, deal.deal_date): deal for deal in buys}
+    # The staging columns are named after the model fields.
+    staged = [(_run_investors, list(fingerprints.items()))]
+    for table, models in ((_run_holdings, held.values()), (_run_deals, dealt.values())):
+        fields = table.c.keys()
+        staged.append((table, [tuple(getattr(row, name) for name in fields) for row in models]))
+    for table, rows in staged:
+        _stage_rows(conn, table, rows, method=method, chunk_size=chunk_size)
+
+
+def _apply_staged(
+    conn, table: Table, staged: Table, scope: Collection[int], *criteria
+) -> SyncResult:
+    """Reconcile ``table`` with the run's ``staged`` rows that match ``criteria``.
+
+    Names and tickers are swapped for ids in the database, then the rows are merged and
+    stale ones deleted as in the copy method.
+    """
+
+    keys = NATURAL_KEYS[table.name]
+    values = VALUE_COLUMNS[table.name]
+    stage = _temp_table(conn, table, "stage", keys + values)
+    source = (
+        select(
+            investors.c.id.label("investor_id"),
+            stocks.c.id.label("stock_id"),
+            *(staged.c[column] for column in keys[2:] + values),
+        )
+        .select_from(
+            staged.join(investors, investors.c.name == staged.c.investor).join(
+                stocks, stocks.c.ticker == staged.c.ticker
             )
-            conn.execute(stmt)
-
-        existing_stmt = select(holdings.c.id, holdings.c.investor_id, holdings.c.stock_id)
-        existing = conn.execute(existing_stmt).all()
-        to_keep = set(grouped.keys())
-        to_remove = [row.id for row in existing if (row.investor_id, row.stock_id) not in to_keep]
-        if to_remove:
-            conn.execute(delete(holdings).where(holdings.c.id.in_(to_remove)))
-    LOGGER.info(
-        "Synchronized %d holdings rows (%d removed)",
-        len(grouped),
-        len(to_remove),
+        )
+        .where(*criteria)
     )
+    stmt = insert(stage).from_select(keys + values, source)
+    count = conn.execute(stmt.execution_options(preserve_rowcount=True)).rowcount
+    result = _merge(conn, table, stage)
+    result.deleted = _delete_unstaged(conn, table, stage, scope)
+    result.unchanged = count - result.inserted - result.updated
+    return result
 
 
-def _sync_deals(engine: Engine, deals_data: Iterable[Deal], table: Table, constraint: str) -> None:
-    grouped: dict[tuple[int, int, date], Deal] = {}
-    with session(engine) as conn:
-        for deal in deals_data:
-            investor_id = _upsert_investor(conn, deal.investor, deal.source_url)
-            stock_id = _upsert_stock(conn, deal.ticker)
-            key = (investor_id, stock_id, deal.deal_date)
-            grouped[key] = deal
-
-        for (investor_id, stock_id, deal_date), deal in grouped.items():
-            stmt = pg_insert(table).values(
-                investor_id=investor_id,
-                stock_id=stock_id,
-                deal_date=deal_date,
-                quantity=deal.quantity,
-                price=deal.price,
+def _unresolved(conn, key_column, *staged_columns) -> set[str]:
+    """Return the values of ``staged_columns`` that ``key_column`` has no row for."""
+
+    stmt = union(
+        *(
+            select(column).where(~exists().where(key_column == column))
+            for column in staged_columns
+        )
+    )
+    return set(conn.execute(stmt).scalars())
+
+
+def _apply_run(conn, state: SyncState) -> None:
+    """Write the staged run to the real tables, inside the caller's transaction."""
+
+    sources = select(_run_holdings.c.investor, _run_holdings.c.source_url).union(
+        select(_run_deals.c.investor, _run_deals.c.source_url)
+    )
+    sources = conn.execute(sources).all()
+    _upsert_investors(conn, sources)
+    tickers = select(_run_holdings.c.ticker).union(select(_run_deals.c.ticker))
+    tickers = conn.execute(tickers).scalars().all()
+    _upsert_stocks(conn, tickers)
+    # Cached ids are not checked, so a row deleted since it was cached shows up here as
+    # a staged name or ticker without a row; evict those and upsert them for real.
+    cache = id_cache(conn.engine)
+    missing = _unresolved(conn, investors.c.name, _run_holdings.c.investor, _run_deals.c.investor)
+    if missing:
+        LOGGER.info("Cached ids of %d investors are stale; resolving them again", len(missing))
+        cache.discard("investors", missing)
+        _upsert_investors(conn, [row for row in sources if row.investor in missing])
+    missing = _unresolved(conn, stocks.c.ticker, _run_holdings.c.ticker, _run_deals.c.ticker)
+    if missing:
+        LOGGER.info("Cached ids of %d tickers are stale; resolving them again", len(missing))
+        cache.discard("stocks", missing)
+        _upsert_stocks(conn, missing)
+    names = conn.execute(select(_run_investors.c.name)).scalars().all()
+    scope = set(_investor_ids(conn, names).values())
+    applied = (
+        (holdings, _run_holdings, ()),
+        (bulk_deals, _run_deals, (_run_deals.c.deal_type == "bulk",)),
+        (block_deals, _run_deals, (_run_deals.c.deal_type == "block",)),
+    )
+    for table, staged, criteria in applied:
+        state.results[table.name].add(_apply_staged(conn, table, staged, scope, *criteria))
+    stmt = update(investors).where(investors.c.name == _run_investors.c.name)
+    conn.execute(stmt.values(content_hash=_run_investors.c.content_hash))
+    _run_metadata.drop_all(conn)
+
+
+def _split_unchanged(
+    conn,
+    names: Collection[str],
+    holdings_data: list[Holding],
+    deals_data: list[Deal],
+    staged: Mapping[str, str] | None = None,
+) -> tuple[list[Holding], list[Deal], dict[str, str], dict[str, int]]:
+    """Drop investors whose scraped content matches the fingerprint stored last run.
+
+    ``names`` lists every investor in the batch, including those without rows, and
+    ``staged`` the fingerprints already staged for them in the current run, which take
+    precedence over the stored ones. An investor matching its stored fingerprint is only
+    skipped while its stored row counts still match the scraped content, so rows added
+    or deleted outside the sync are repaired on the next run. Returns the remaining
+    rows, the new fingerprint of each remaining investor and the ids of the remaining
+    investors already in the database.
+    """
+
+    staged = staged or {}
+    by_investor: dict[str, tuple[list[Holding], list[Deal]]] = {name: ([], []) for name in names}
+    for holding in holdings_data:
+        by_investor[holding.investor][0].append(holding)
+    for deal in deals_data:
+        by_investor[deal.investor][1].append(deal)
+    stored = {
+        row.name: row
+        for row in conn.execute(
+            select(investors.c.id, investors.c.name, investors.c.content_hash).where(
+                investors.c.name.in_(by_investor)
             )
-            stmt = stmt.on_conflict_do_update(
-                constraint=constraint,
-                set_={
-                    "quantity": stmt.excluded.quantity,
-                    "price": stmt.excluded.price,
-                    "updated_at": datetime.utcnow(),
-                },
+        )
+    }
+    fingerprints = {
+        name: content_fingerprint(investor_holdings, investor_deals)
+        for name, (investor_holdings, investor_deals) in by_investor.items()
+    }
+    unchanged: set[str] = set()
+    for name, fingerprint in fingerprints.items():
+        row = stored.get(name)
+        if fingerprint == (staged[name] if name in staged else row and row.content_hash):
+            unchanged.add(name)
+    recheck = {stored[name].id: name for name in unchanged - staged.keys()}
+    if recheck:
+        for investor_id, counts in _stored_row_counts(conn, recheck).items():
+            name = recheck[investor_id]
+            if counts != _row_counts(*by_investor[name]):
+                LOGGER.info("Stored rows for %s changed outside the sync; rewriting", name)
+                unchanged.discard(name)
+    changed_holdings: list[Holding] = []
+    changed_deals: list[Deal] = []
+    for name, (investor_holdings, investor_deals) in by_investor.items():
+        if name in unchanged:
+            LOGGER.debug("Content for %s unchanged; skipping sync", name)
+            del fingerprints[name]
+            continue
+        changed_holdings.extend(investor_holdings)
+        changed_deals.extend(investor_deals)
+    known = {name: stored[name].id for name in fingerprints if name in stored}
+    return changed_holdings, changed_deals, fingerprints, known
+
+
+def sync_investor_batch(
+    engine: Engine,
+    holdings_data: Iterable[Holding],
+    deals_data: Iterable[Deal],
+    state: SyncState,
+    *,
+    investor_names: Iterable[str] = (),
+    method: str = "upsert",
+    chunk_size: int = UPSERT_CHUNK_SIZE,
+) -> None:
+    """Synchronize one batch of investors as soon as it has been scraped.
+
+    Rows are written as in :func:`sync_holdings` and the deal syncs. Every table is
+    replaced for the investors in the batch, i.e. those present in the rows or named
+    in ``investor_names`` (investors fetched without any rows), and only for them.
+    Investors whose content fingerprint matches the last sync are skipped entirely.
+
+    Investors and tickers are resolved once for all three tables. With a state from
+    :func:`begin_sync` the batch is only staged; :func:`finish_sync` writes it.
+    """
+
+    holdings_data = list(holdings_data)
+    deals_data = list(deals_data)
+    names = {
+        *investor_names,
+        *(holding.investor for holding in holdings_data),
+        *(deal.investor for deal in deals_data),
+    }
+    state.investors += len(names)
+    if state.conn is not None:
+        conn = state.conn
+        with conn.begin():
+            stmt = select(_run_investors).where(_run_investors.c.name.in_(names))
+            staged = dict(conn.execute(stmt).tuples().all())
+            changed_holdings, changed_deals, fingerprints, _ = _split_unchanged(
+                conn, names, holdings_data, deals_data, staged
             )
-            conn.execute(stmt)
-
-        existing_stmt = select(table.c.id, table.c.investor_id, table.c.stock_id, table.c.deal_date)
-        existing = conn.execute(existing_stmt).all()
-        to_keep = set(grouped.keys())
-        to_remove = [
-            row.id
-            for row in existing
-            if (row.investor_id, row.stock_id, row.deal_date) not in to_keep
-        ]
-        if to_remove:
-            conn.execute(delete(table).where(table.c.id.in_(to_remove)))
-    LOGGER.info(
-        "Synchronized %d %s rows (%d removed)",
-        len(grouped),
-        table.name,
-        len(to_remove),
-    )
+            state.unchanged += len(names) - len(fingerprints)
+            if fingerprints:
+                _stage_batch(
+                    conn,
+                    changed_holdings,
+                    changed_deals,
+                    fingerprints,
+                    method=method,
+                    chunk_size=chunk_size,
+                )
+        return
 
+    def write(conn) -> tuple[int, dict[str, SyncResult]]:
+        changed_holdings, changed_deals, fingerprints, known = _split_unchanged(
+            conn, names, holdings_data, deals_data
+        )
+        results: dict[str, SyncResult] = {}
+        if not fingerprints:
+            return len(names), results
+        buys = {kind: _buy_deals(changed_deals, kind) for kind in ("bulk", "block")}
+        ids = _resolve_ids(conn, [*changed_holdings, *buys["bulk"], *buys["block"]])
+        batches: list[tuple[Table, dict]] = [(holdings, _group_holdings(changed_holdings, ids))]
+        for table, deal_type in ((bulk_deals, "bulk"), (block_deals, "block")):
+            batches.append((table, _group_deals(buys[deal_type], ids)))
+        scope = set(known.values())
+        for _, grouped in batches:
+            scope.update(key[0] for key in grouped)
+        for table, grouped in batches:
+            results[table.name] = _sync_table(
+                conn, table, grouped, scope, method=method, chunk_size=chunk_size
+            )
+        for name, fingerprint in fingerprints.items():
+            stmt = update(investors).where(investors.c.name == name)
+            conn.execute(stmt.values(content_hash=fingerprint))
+        return len(names) - len(fingerprints), results
 
-def sync_bulk_deals(engine: Engine, deals_data: Iterable[Deal]) -> None:
-    """Synchronize bulk deals, keeping only buy transactions."""
+    unchanged, results = _with_fresh_ids(engine, [*holdings_data, *deals_data], write)
+    state.unchanged += unchanged
+    for name, result in results.items():
+        state.results[name].add(result)
 
-    filtered = [deal for deal in deals_data if deal.deal_type.lower() == "bulk" and deal.side.lower() == "buy"]
-    _sync_deals(engine, filtered, bulk_deals, UNIQUE_CONSTRAINTS["bulk_deals"])
 
+def finish_sync(state: SyncState) -> None:
+    """Apply the run staged since :func:`begin_sync`, if any, and log its totals.
 
-def sync_block_deals(engine: Engine, deals_data: Iterable[Deal]) -> None:
-    """Synchronize block deals, keeping only buy transactions."""
+    Investors, stocks and the three tables are written in one transaction, so readers
+    see either the previous run or all of this one.
+    """
 
-    filtered = [deal for deal in deals_data if deal.deal_type.lower() == "block" and deal.side.lower() == "buy"]
-    _sync_deals(engine, filtered, block_deals, UNIQUE_CONSTRAINTS["block_deals"])
+    if state.conn is not None:
+        conn, state.conn = state.conn, None
+        try:
+            with conn.begin():
+                _apply_run(conn, state)
+        except BaseException:
+            conn.invalidate()
+            raise
+        finally:
+            conn.close()
+    LOGGER.info(
+        "Synchronized %d investors (%d unchanged and skipped)", state.investors, state.unchanged
+    )
+    for name, result in state.results.items():
+        _log_result(name, result)
 
 
 def fetch_holdings_view(engine: Engine) -> list[dict[str, object]]:
@@ -368,6 +1332,12 @@ def update_schedule(engine: Engine, hour: int, minute: int, timezone: str = "UTC
                 "timezone": stmt.excluded.timezone,
                 "updated_at": datetime.utcnow(),
             },
+            where=or_(
+                *(
+                    ingest_schedule.c[column].is_distinct_from(stmt.excluded[column])
+                    for column in ("hour", "minute", "timezone")
+                )
+            ),
         )
         conn.execute(stmt)
 
@@ -380,6 +1350,18 @@ __all__ = [
     "sync_holdings",
     "sync_bulk_deals",
     "sync_block_deals",
+    "sync_investor_batch",
+    "begin_sync",
+    "finish_sync",
+    "abort_sync",
+    "sync_run",
+    "content_fingerprint",
+    "IdCache",
+    "UPSERT_CHUNK_SIZE",
+    "id_cache",
+    "warm_id_cache",
+    "SyncState",
+    "SyncResult",
     "metadata",
     "investors",
     "stocks",
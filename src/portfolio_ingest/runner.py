@@ -2,52 +2,603 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
-from typing import Iterable, List
+import multiprocessing
+import queue
+import threading
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import aclosing, nullcontext
+from dataclasses import dataclass, field, replace
+from functools import partial
+from typing import AsyncIterator, Iterable, Iterator, List, Mapping
 
-from .config import Settings
+import httpx
+from sqlalchemy.engine import Engine
+
+from .config import SYNC_METHODS, Settings
 from .db import (
+    SyncState,
+    abort_sync,
+    begin_sync,
     create_db_engine,
     ensure_schema,
-    sync_block_deals,
-    sync_bulk_deals,
-    sync_holdings,
+    finish_sync,
+    sync_investor_batch,
+    sync_run,
+    warm_id_cache,
 )
 from .logging_utils import configure_logging
 from .models import Deal, Holding
-from .sources import create_source
+from .sources import (
+    FALLBACK_PARSER,
+    LATEST,
+    ArchiveRecorder,
+    ArchiveReplay,
+    DeadlineExceeded,
+    HostRateLimiter,
+    Page,
+    PageArchive,
+    PageSource,
+    ParseCache,
+    ResponseCache,
+    RetryPolicy,
+    RunDeadline,
+    SessionRegistry,
+    SourceSnapshot,
+    Timeout,
+    create_async_source,
+    seed_cookies,
+    available_parsers,
+    compare_parsers,
+    create_source,
+    host_of,
+    parse_page,
+)
 
 LOGGER = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class _FetchContext:
+    """Collaborators shared by every investor fetch within one run."""
+
+    targets: dict[str, str]
+    retry: RetryPolicy
+    deadline: RunDeadline
+    timeout: Timeout
+    parser: str | None = None
+    cache: ResponseCache | None = None
+    parse_cache: ParseCache | None = None
+    limiter: HostRateLimiter | None = None
+    sessions: SessionRegistry | None = None
+    client: httpx.AsyncClient | None = None
+    recorder: ArchiveRecorder | None = None
+    replay: ArchiveReplay | None = None
+    parsers: Executor | None = None
+    stopping: threading.Event = field(default_factory=threading.Event)
+
+
+@dataclass(slots=True)
+class InvestorResult:
+    """Holdings and deals scraped for one investor."""
+
+    index: int
+    investor: str
+    url: str
+    holdings: List[Holding]
+    deals: List[Deal]
+
+
+def _selected(targets: dict[str, str], names: tuple[str, ...]) -> dict[str, str]:
+    """Restrict ``targets`` to the investors in ``names``; empty ``names`` keeps all."""
+
+    if not names:
+        return targets
+    unknown = [name for name in names if name not in targets]
+    if unknown:
+        raise RuntimeError(
+            f"Unknown investor(s) {', '.join(map(repr, unknown))}; "
+            f"choose from {', '.join(map(repr, targets))}"
+        )
+    return {name: url for name, url in targets.items() if name in names}
+
+
+def _fetch_context(settings: Settings) -> _FetchContext:
+    context = _FetchContext(
+        targets=_selected(dict(settings.investor_sources), settings.selected_investors),
+        retry=RetryPolicy(attempts=settings.http_retries + 1, backoff=settings.http_backoff),
+        deadline=RunDeadline(settings.run_timeout or None),
+        timeout=(settings.http_connect_timeout, settings.http_read_timeout),
+        parser=settings.html_parser,
+    )
+    if settings.archive_mode != "off":
+        if not settings.archive_dir:
+            raise RuntimeError("PORTFOLIO_INGEST_ARCHIVE_DIR must be set to record or replay runs")
+        archive = PageArchive(settings.archive_dir)
+        if settings.archive_mode == "replay":
+            # Replays read every page from the archive and parse it afresh, so neither the
+            # network helpers nor the caches are involved.
+            context.replay = archive.replay(settings.archive_run)
+            context.targets = _selected(context.replay.targets, settings.selected_investors)
+            LOGGER.info("Replaying archived run %s", context.replay.run_id)
+            return context
+        context.recorder = archive.record(context.targets)
+        LOGGER.info("Recording pages as archived run %s", context.recorder.run_id)
+    if settings.cache_dir:
+        LOGGER.debug("Using response cache at %s", settings.cache_dir)
+        context.cache = ResponseCache(settings.cache_dir)
+    if settings.parse_cache_dir:
+        LOGGER.debug("Using parse cache at %s", settings.parse_cache_dir)
+        context.parse_cache = ParseCache(settings.parse_cache_dir)
+    if settings.rate_limit > 0:
+        context.limiter = HostRateLimiter(settings.rate_limit, max_rate=settings.rate_limit_max)
+    return context
+
+
+def _fetch_page(context: _FetchContext, investor: str, url: str, source: PageSource) -> Page:
+    """Download a page, archiving the body (or the failure) when recording."""
+
+    try:
+        context.deadline.check()
+        page = source.fetch_page()
+    except Exception as exc:
+        if context.recorder is not None:
+            context.recorder.fail(investor, url, exc)
+        raise
+    if context.recorder is not None:
+        context.recorder.add(investor, page)
+    return page
+
+
+def _parse_pool(settings: Settings, pages: int) -> Executor | None:
+    """Open the process pool pages are parsed in, or ``None`` to parse inline."""
+
+    workers = min(settings.parse_workers, pages)
+    if workers <= 1:
+        return None
+    LOGGER.debug("Parsing pages in %d worker processes", workers)
+    # Spawned workers do not inherit the fetch threads' locks the way forked ones would.
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+
+def _remember(source: PageSource, page: Page, future: Future[SourceSnapshot]) -> None:
+    if not future.cancelled() and future.exception() is None:
+        source.remember(page, future.result())
+
+
+def _parse(context: _FetchContext, source: PageSource, page: Page) -> Future[SourceSnapshot]:
+    """Hand ``page`` to the parse stage without waiting for the result.
+
+    Parse cache lookups and writes stay in this process; only pages that actually need
+    parsing are shipped to the worker processes.
+    """
+
+    if context.parsers is None:
+        parsed: Future[SourceSnapshot] = Future()
+        try:
+            parsed.set_result(source.snapshot(page))
+        except Exception as exc:
+            parsed.set_exception(exc)
+        return parsed
+    cached = source.cached_snapshot(page)
+    if cached is not None:
+        parsed = Future()
+        parsed.set_result(cached)
+        return parsed
+    parsed = context.parsers.submit(
+        parse_page, source.investor, source.url, page.body, page.encoding, source.parser
+    )
+    if source.parse_cache is not None:
+        parsed.add_done_callback(partial(_remember, source, page))
+    return parsed
+
+
+def _parsed_result(
+    investor: str, url: str, parsed: Future[SourceSnapshot] | None
+) -> tuple[List[Holding], List[Deal]] | None:
+    if parsed is None:
+        return None
+    try:
+        snapshot = parsed.result()
+    except Exception as exc:  # pragma: no cover - defensive logging
+        LOGGER.exception("Failed to parse data for %s (%s): %s", investor, url, exc)
+        return None
+    return snapshot.holdings, snapshot.deals
+
+
+def _fetch_investor(
+    investor: str,
+    url: str,
+    context: _FetchContext,
+    host_limits: Mapping[str, threading.BoundedSemaphore],
+) -> Future[SourceSnapshot] | None:
+    """Fetch one investor and queue its parse, returning ``None`` when the fetch fails."""
+
+    with host_limits[host_of(url)]:
+        LOGGER.info("Fetching data for %s", investor)
+        try:
+            source = create_source(
+                investor,
+                url,
+                context.sessions,
+                context.cache,
+                context.timeout,
+                context.parser,
+                context.parse_cache,
+            )
+            if context.replay is not None:
+                page = context.replay.page(investor, url)
+            else:
+                page = _fetch_page(context, investor, url, source)
+        except DeadlineExceeded as exc:
+            LOGGER.warning("Skipped %s (%s): %s", investor, url, exc)
+            return None
+        except Exception as exc:  # pragma: no cover - defensive logging
+            LOGGER.exception("Failed to gather data for %s (%s): %s", investor, url, exc)
+            return None
+    return _parse(context, source, page)
+
+
+def _stream_investor(
+    index: int,
+    investor: str,
+    url: str,
+    context: _FetchContext,
+    host_limits: Mapping[str, threading.BoundedSemaphore],
+    buffer: threading.Semaphore,
+    finished: queue.SimpleQueue[tuple[int, Future[SourceSnapshot] | None]],
+) -> None:
+    """Fetch one investor once the pipeline has room and report its parse to ``finished``."""
+
+    buffer.acquire()
+    if context.stopping.is_set():
+        return
+    parsed = None
+    try:
+        parsed = _fetch_investor(investor, url, context, host_limits)
+    except Exception as exc:  # pragma: no cover - defensive logging
+        LOGGER.exception("Failed to gather data for %s (%s): %s", investor, url, exc)
+    if parsed is None:
+        finished.put((index, None))
+    else:
+        parsed.add_done_callback(lambda done: finished.put((index, done)))
+
+
+def stream_data(settings: Settings) -> Iterator[InvestorResult]:
+    """Yield each investor's holdings and deals as soon as they are parsed.
+
+    Investors are fetched concurrently by up to ``settings.fetch_workers`` threads with
+    at most ``settings.fetch_per_host`` requests in flight against any one host, and
+    parsed in those threads or, when ``settings.parse_workers`` is above one, in that
+    many processes. At most
+    ``settings.pipeline_buffer`` investors are in flight between download and the
+    consumer; fetching pauses until the consumer catches up. Results arrive in
+    completion order; investors that fail are logged and skipped.
+    """
+
+    context = _fetch_context(settings)
+    targets = list(context.targets.items())
+    host_limits = {
+        host: threading.BoundedSemaphore(settings.fetch_per_host)
+        for host in {host_of(url) for _, url in targets}
+    }
+    workers = max(1, min(settings.fetch_workers, len(targets)))
+    LOGGER.debug("Fetching %d investors with %d workers", len(targets), workers)
+    context.sessions = SessionRegistry(
+        pool_connections=settings.http_pool_connections,
+        pool_maxsize=settings.http_pool_maxsize,
+        limiter=context.limiter,
+        retry=context.retry,
+        deadline=context.deadline,
+    )
+    buffer = threading.Semaphore(settings.pipeline_buffer)
+    finished: queue.SimpleQueue[tuple[int, Future[SourceSnapshot] | None]] = queue.SimpleQueue()
+    succeeded = 0
+    with _parse_pool(settings, len(targets)) or nullcontext() as context.parsers:
+        with context.sessions, ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="fetch"
+        ) as pool:
+            for index, (investor, url) in enumerate(targets):
+                pool.submit(
+                    _stream_investor,
+                    index,
+                    investor,
+                    url,
+                    context,
+                    host_limits,
+                    buffer,
+                    finished,
+                )
+            try:
+                for _ in targets:
+                    index, parsed = finished.get()
+                    investor, url = targets[index]
+                    result = _parsed_result(investor, url, parsed)
+                    try:
+                        if result is not None:
+                            succeeded += 1
+                            yield InvestorResult(index, investor, url, *result)
+                    finally:
+                        buffer.release()
+            finally:
+                # Unblock fetchers still waiting for room when the consumer stops early.
+                context.stopping.set()
+                for _ in targets:
+                    buffer.release()
+    _finish(context, succeeded)
+
+
 def gather_data(settings: Settings) -> tuple[List[Holding], List[Deal]]:
-    """Collect holdings and deal data from all configured sources."""
+    """Collect holdings and deal data from all configured sources.
 
-    holdings: List[Holding] = []
-    deals: List[Deal] = []
-    for investor, url in settings.investor_sources.items():
-        source = create_source(investor, url)
+    Runs :func:`stream_data` to completion and returns the results in the configured
+    investor order regardless of completion order.
+    """
+
+    results = sorted(stream_data(settings), key=lambda result: result.index)
+    return _merge_results(results)
+
+
+def _finish(context: _FetchContext, succeeded: int) -> None:
+    if context.parse_cache is not None:
+        context.parse_cache.log_stats()
+    if context.recorder is not None:
+        context.recorder.close(succeeded=succeeded)
+
+
+async def _fetch_investor_async(
+    investor: str,
+    url: str,
+    context: _FetchContext,
+    workers: asyncio.Semaphore,
+    host_limits: Mapping[str, asyncio.Semaphore],
+) -> tuple[List[Holding], List[Deal]] | None:
+    """Asyncio counterpart of :func:`_fetch_investor`."""
+
+    async with workers, host_limits[host_of(url)]:
         LOGGER.info("Fetching data for %s", investor)
         try:
-            holdings.extend(source.fetch_holdings())
-            deals.extend(source.fetch_deals())
+            source = create_async_source(
+                investor,
+                url,
+                context.client,
+                cache=context.cache,
+                limiter=context.limiter,
+                retry=context.retry,
+                deadline=context.deadline,
+                timeout=context.timeout,
+                parser=context.parser,
+                parse_cache=context.parse_cache,
+            )
+            try:
+                context.deadline.check()
+                page = await source.fetch_page()
+            except Exception as exc:
+                if context.recorder is not None:
+                    context.recorder.fail(investor, url, exc)
+                raise
+            if context.recorder is not None:
+                await asyncio.to_thread(context.recorder.add, investor, page)
+        except DeadlineExceeded as exc:
+            LOGGER.warning("Skipped %s (%s): %s", investor, url, exc)
+            return None
         except Exception as exc:  # pragma: no cover - defensive logging
             LOGGER.exception("Failed to gather data for %s (%s): %s", investor, url, exc)
+            return None
+    # _parse may read the parse cache or, without a process pool, parse in-process.
+    parsed = await asyncio.to_thread(_parse, context, source.source, page)
+    await asyncio.wait([asyncio.wrap_future(parsed)])
+    return _parsed_result(investor, url, parsed)
+
+
+async def _stream_investor_async(
+    index: int,
+    investor: str,
+    url: str,
+    context: _FetchContext,
+    workers: asyncio.Semaphore,
+    host_limits: Mapping[str, asyncio.Semaphore],
+    buffer: asyncio.Semaphore,
+    finished: asyncio.Queue[tuple[int, tuple[List[Holding], List[Deal]] | None]],
+) -> None:
+    await buffer.acquire()
+    result = None
+    try:
+        result = await _fetch_investor_async(investor, url, context, workers, host_limits)
+    except Exception as exc:  # pragma: no cover - defensive logging
+        LOGGER.exception("Failed to gather data for %s (%s): %s", investor, url, exc)
+    finally:
+        finished.put_nowait((index, result))
+
+
+async def stream_data_async(settings: Settings) -> AsyncIterator[InvestorResult]:
+    """Asyncio counterpart of :func:`stream_data`.
+
+    Downloads are multiplexed over a single pooled :class:`httpx.AsyncClient` with the
+    same worker, per-host and buffer limits, and parsed in the same process pool.
+    """
+
+    # Opening the archive and caches reads the disk (the parse cache prunes itself).
+    context = await asyncio.to_thread(_fetch_context, settings)
+    if context.replay is not None:
+        # Replays never touch the network; run the threaded pipeline off the loop.
+        results = stream_data(settings)
+        while (result := await asyncio.to_thread(next, results, None)) is not None:
+            yield result
+        return
+    targets = list(context.targets.items())
+    workers = asyncio.Semaphore(max(1, settings.fetch_workers))
+    host_limits = {
+        host: asyncio.Semaphore(settings.fetch_per_host)
+        for host in {host_of(url) for _, url in targets}
+    }
+    limits = httpx.Limits(
+        max_connections=settings.fetch_workers,
+        max_keepalive_connections=settings.http_pool_maxsize,
+    )
+    buffer = asyncio.Semaphore(settings.pipeline_buffer)
+    finished: asyncio.Queue[tuple[int, tuple[List[Holding], List[Deal]] | None]] = asyncio.Queue()
+    succeeded = 0
+    context.parsers = _parse_pool(settings, len(targets))
+    try:
+        async with httpx.AsyncClient(follow_redirects=True, limits=limits) as context.client:
+            seed_cookies(context.client, (url for _, url in targets))
+            tasks = [
+                asyncio.create_task(
+                    _stream_investor_async(
+                        index, investor, url, context, workers, host_limits, buffer, finished
+                    )
+                )
+                for index, (investor, url) in enumerate(targets)
+            ]
+            try:
+                for _ in targets:
+                    index, result = await finished.get()
+                    try:
+                        if result is not None:
+                            succeeded += 1
+                            investor, url = targets[index]
+                            yield InvestorResult(index, investor, url, *result)
+                    finally:
+                        buffer.release()
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+    finally:
+        if context.parsers is not None:
+            # Shutting the pool down waits for its worker processes to exit.
+            await asyncio.to_thread(context.parsers.shutdown)
+    # Closing the archive writes its manifest.
+    await asyncio.to_thread(_finish, context, succeeded)
+
+
+async def gather_data_async(settings: Settings) -> tuple[List[Holding], List[Deal]]:
+    """Collect holdings and deal data on the running event loop.
+
+    Asyncio counterpart of :func:`gather_data`.
+    """
+
+    async with aclosing(stream_data_async(settings)) as stream:
+        results = [result async for result in stream]
+    return _merge_results(sorted(results, key=lambda result: result.index))
+
+
+def verify_parsers(settings: Settings) -> int:
+    """Parse every page of an archived run with each installed backend.
+
+    Each backend, with and without the strainer, is checked against a full
+    ``html.parser`` parse. Returns the number of pages whose holdings or deals differ,
+    so a faster parser can be checked before it is switched on.
+    """
+
+    if not settings.archive_dir:
+        raise RuntimeError("PORTFOLIO_INGEST_ARCHIVE_DIR must be set to verify parsers")
+    replay = PageArchive(settings.archive_dir).replay(settings.archive_run)
+    parsers = available_parsers()
+    LOGGER.info("Comparing parsers %s over archived run %s", ", ".join(parsers), replay.run_id)
+    checked = mismatches = 0
+    for investor, url in replay.targets.items():
+        try:
+            page = replay.page(investor, url)
+        except LookupError as exc:
+            LOGGER.debug("Skipping %s: %s", investor, exc)
+            continue
+        differing = compare_parsers(create_source(investor, url), page, parsers)
+        checked += 1
+        if differing:
+            mismatches += 1
+            LOGGER.error(
+                "%s parses differently with %s than with a full %s parse",
+                investor,
+                ", ".join(differing),
+                FALLBACK_PARSER,
+            )
+    LOGGER.info("Verified %d archived pages, %d mismatches", checked, mismatches)
+    return mismatches
+
+
+def _merge_results(results: Iterable[InvestorResult]) -> tuple[List[Holding], List[Deal]]:
+    holdings: List[Holding] = []
+    deals: List[Deal] = []
+    for result in results:
+        holdings.extend(result.holdings)
+        deals.extend(result.deals)
     return holdings, deals
 
 
+def _write(
+    engine: Engine, settings: Settings, result: InvestorResult, state: SyncState
+) -> None:
+    LOGGER.debug(
+        "Writing %d holdings and %d deals for %s",
+        len(result.holdings),
+        len(result.deals),
+        result.investor,
+    )
+    sync_investor_batch(
+        engine,
+        result.holdings,
+        result.deals,
+        state,
+        investor_names=[result.investor],
+        method=settings.sync_method,
+        chunk_size=settings.upsert_chunk_size,
+    )
+
+
 def run_ingestion(settings: Settings) -> None:
-    """Run the ingestion process."""
+    """Run the ingestion process.
+
+    Each investor is staged in the database as soon as its page is parsed, while the
+    remaining investors are still being fetched, and the whole run is applied in one
+    short transaction once fetching ends, so readers never see a partially written
+    run. Only investors fetched successfully are touched; the rows of investors that
+    fail keep their previous contents.
+    """
 
     LOGGER.info("Starting ingestion run")
     engine = create_db_engine(settings.database_url)
     ensure_schema(engine)
+    warm_id_cache(engine, settings.id_cache_size)
+
+    with sync_run(engine) as state:
+        for result in stream_data(settings):
+            _write(engine, settings, result, state)
+    LOGGER.info("Ingestion run complete")
+
+
+async def run_ingestion_async(settings: Settings) -> None:
+    """Run the ingestion process from within an asyncio event loop.
+
+    Page downloads share the loop; the blocking database work runs in one dedicated
+    thread, staging each investor's results as they arrive and applying the run at the
+    end. Running every call on that thread in order means a failed or cancelled run is
+    only discarded once the write in progress has released the run's connection.
+    """
+
+    LOGGER.info("Starting ingestion run")
+    engine = create_db_engine(settings.database_url)
+    await asyncio.to_thread(ensure_schema, engine)
+    await asyncio.to_thread(warm_id_cache, engine, settings.id_cache_size)
 
-    holdings, deals = gather_data(settings)
-    LOGGER.info("Fetched %d holdings entries and %d deals", len(holdings), len(deals))
-    sync_holdings(engine, holdings)
-    sync_bulk_deals(engine, deals)
-    sync_block_deals(engine, deals)
+    loop = asyncio.get_running_loop()
+    writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-writer")
+    try:
+        state = await loop.run_in_executor(writer, begin_sync, engine)
+        try:
+            async with aclosing(stream_data_async(settings)) as stream:
+                async for result in stream:
+                    await loop.run_in_executor(writer, _write, engine, settings, result, state)
+        except BaseException:
+            # Queued behind a write that is still running; shielded so a second
+            # cancellation cannot withdraw it before it starts.
+            await asyncio.shield(loop.run_in_executor(writer, abort_sync, state))
+            raise
+        await loop.run_in_executor(writer, finish_sync, state)
+    finally:
+        writer.shutdown(wait=False)
     LOGGER.info("Ingestion run complete")
 
 
@@ -58,6 +609,41 @@ def parse_args(args: Iterable[str] | None = None) -> argparse.Namespace:
         action="store_true",
         help="Enable debug logging output",
     )
+    parser.add_argument(
+        "--archive-dir",
+        help="Directory of the page archive (overrides PORTFOLIO_INGEST_ARCHIVE_DIR)",
+    )
+    parser.add_argument(
+        "--investor",
+        action="append",
+        metavar="NAME",
+        help="Only fetch and sync this investor (repeat for several); others are left untouched",
+    )
+    parser.add_argument(
+        "--sync-method",
+        choices=SYNC_METHODS,
+        help="How rows are written to the database (overrides PORTFOLIO_INGEST_SYNC_METHOD)",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--record",
+        action="store_true",
+        help="Archive every fetched investor page for later replay",
+    )
+    mode.add_argument(
+        "--replay",
+        nargs="?",
+        const=LATEST,
+        metavar="RUN_ID",
+        help="Ingest an archived run instead of the network (defaults to the latest run)",
+    )
+    mode.add_argument(
+        "--verify-parsers",
+        nargs="?",
+        const=LATEST,
+        metavar="RUN_ID",
+        help="Compare every installed HTML parser over an archived run and exit",
+    )
     return parser.parse_args(args=args)
 
 
@@ -65,6 +651,19 @@ def main(argv: Iterable[str] | None = None) -> None:
     options = parse_args(argv)
     configure_logging("DEBUG" if options.verbose else None)
     settings = Settings.load()
+    if options.archive_dir:
+        settings = replace(settings, archive_dir=options.archive_dir)
+    if options.sync_method:
+        settings = replace(settings, sync_method=options.sync_method)
+    if options.investor:
+        settings = replace(settings, selected_investors=tuple(options.investor))
+    if options.verify_parsers:
+        settings = replace(settings, archive_run=options.verify_parsers)
+        raise SystemExit(1 if verify_parsers(settings) else 0)
+    if options.record:
+        settings = replace(settings, archive_mode="record")
+    elif options.replay:
+        settings = replace(settings, archive_mode="replay", archive_run=options.replay)
     run_ingestion(settings)
 
 
@@ -2,24 +2,163 @@
 from __future__ import annotations
 
 import logging
+from typing import Iterable
 
-from .base import InvestorSource
+import httpx
+
+from .aio import AsyncInvestorSource
+from .archive import LATEST, ArchiveRecorder, ArchiveReplay, PageArchive
+from .base import (
+    REQUEST_TIMEOUT,
+    InvestorSource,
+    Page,
+    PageSource,
+    SourceSnapshot,
+    decode_body,
+)
+from .cache import ParseCache, ResponseCache
+from .parsing import FALLBACK_PARSER, available_parsers, compare_parsers, resolve_parser
+from .transport import (
+    DeadlineExceeded,
+    RetryPolicy,
+    RunDeadline,
+    SessionRegistry,
+    Timeout,
+    host_of,
+)
+from .throttle import HostRateLimiter
 from .screener import ScreenerSource
 from .trendlyne import TrendlyneSource
 
 LOGGER = logging.getLogger(__name__)
 
 
-def create_source(investor: str, url: str) -> InvestorSource:
-    """Instantiate the correct source implementation based on the URL."""
+def source_class_for(url: str) -> type[PageSource]:
+    """Return the source implementation serving ``url``."""
 
     if "screener.in" in url:
-        LOGGER.debug("Selected ScreenerSource for %s", investor)
-        return ScreenerSource(investor, url)
+        return ScreenerSource
     if "trendlyne.com" in url:
-        LOGGER.debug("Selected TrendlyneSource for %s", investor)
-        return TrendlyneSource(investor, url)
+        return TrendlyneSource
     raise ValueError(f"Unsupported source URL: {url}")
 
 
-__all__ = ["create_source", "InvestorSource", "ScreenerSource", "TrendlyneSource"]
+def create_source(
+    investor: str,
+    url: str,
+    sessions: SessionRegistry | None = None,
+    cache: ResponseCache | None = None,
+    timeout: Timeout = REQUEST_TIMEOUT,
+    parser: str | None = None,
+    parse_cache: ParseCache | None = None,
+) -> PageSource:
+    """Instantiate the correct source implementation based on the URL.
+
+    When ``sessions`` is supplied the source reuses the pooled session for the URL's
+    host instead of opening a new one. ``cache`` enables conditional requests and
+    ``parse_cache`` reuses earlier parses of byte-identical pages. ``parser`` names the
+    BeautifulSoup tree builder; the fastest installed one is used by default.
+    """
+
+    source_class = source_class_for(url)
+    LOGGER.debug("Selected %s for %s", source_class.__name__, investor)
+    session = None
+    if sessions is not None:
+        session = sessions.session_for(
+            url, source_class.DEFAULT_HEADERS, source_class.DEFAULT_COOKIES
+        )
+    return source_class(
+        investor,
+        url,
+        session=session,
+        cache=cache,
+        timeout=timeout,
+        parser=parser,
+        parse_cache=parse_cache,
+    )
+
+
+def create_async_source(
+    investor: str,
+    url: str,
+    client: httpx.AsyncClient,
+    cache: ResponseCache | None = None,
+    limiter: HostRateLimiter | None = None,
+    retry: RetryPolicy | None = None,
+    deadline: RunDeadline | None = None,
+    timeout: Timeout = REQUEST_TIMEOUT,
+    parser: str | None = None,
+    parse_cache: ParseCache | None = None,
+) -> AsyncInvestorSource:
+    """Instantiate an asyncio source that downloads through ``client``."""
+
+    source = create_source(
+        investor, url, cache=cache, timeout=timeout, parser=parser, parse_cache=parse_cache
+    )
+    return AsyncInvestorSource(source, client, limiter, retry, deadline)
+
+
+def seed_cookies(client: httpx.AsyncClient, urls: Iterable[str]) -> None:
+    """Load the default cookies of each URL's host into ``client``, once per host.
+
+    Requests then send whatever the jar holds, including cookies the server refreshed.
+    Unsupported URLs are skipped; :func:`create_async_source` reports them.
+    """
+
+    seeded: set[str] = set()
+    for url in urls:
+        host = host_of(url)
+        if host in seeded:
+            continue
+        seeded.add(host)
+        try:
+            cookies = source_class_for(url).DEFAULT_COOKIES
+        except ValueError:
+            continue
+        for name, value in cookies.items():
+            client.cookies.set(name, value, domain=httpx.URL(url).host)
+
+
+def parse_page(
+    investor: str, url: str, body: bytes, encoding: str | None, parser: str | None = None
+) -> SourceSnapshot:
+    """Parse a downloaded page body into holdings and deals.
+
+    Takes and returns only picklable values so it can run in a worker process.
+    """
+
+    source = create_source(investor, url, parser=parser)
+    return source.parse(decode_body(body, encoding))
+
+
+__all__ = [
+    "create_source",
+    "create_async_source",
+    "parse_page",
+    "ArchiveRecorder",
+    "ArchiveReplay",
+    "AsyncInvestorSource",
+    "DeadlineExceeded",
+    "FALLBACK_PARSER",
+    "HostRateLimiter",
+    "LATEST",
+    "InvestorSource",
+    "Page",
+    "PageArchive",
+    "PageSource",
+    "ParseCache",
+    "ResponseCache",
+    "RetryPolicy",
+    "RunDeadline",
+    "ScreenerSource",
+    "SessionRegistry",
+    "SourceSnapshot",
+    "Timeout",
+    "TrendlyneSource",
+    "available_parsers",
+    "compare_parsers",
+    "host_of",
+    "resolve_parser",
+    "seed_cookies",
+    "source_class_for",
+]
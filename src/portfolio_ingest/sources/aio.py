@@ -0,0 +1,125 @@
+"""Asyncio variants of the investor sources built on httpx."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import List
+
+import httpx
+
+from ..models import Deal, Holding
+from .base import Page, PageSource, SourceSnapshot
+from .cache import CacheEntry
+from .throttle import HostRateLimiter, parse_retry_after
+from .transport import RetryPolicy, RunDeadline, host_of
+
+LOGGER = logging.getLogger(__name__)
+
+
+class AsyncInvestorSource:
+    """Download an investor page on the event loop and parse it with a :class:`PageSource`.
+
+    The wrapped source supplies the browser-like headers and the table walkers, so both
+    transports produce identical holdings and deals. Cookies come from the client's jar,
+    seeded once per host by :func:`~portfolio_ingest.sources.seed_cookies`.
+    """
+
+    def __init__(
+        self,
+        source: PageSource,
+        client: httpx.AsyncClient,
+        limiter: HostRateLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        deadline: RunDeadline | None = None,
+    ) -> None:
+        self.source = source
+        self.client = client
+        self.limiter = limiter
+        self.retry = retry or RetryPolicy()
+        self.deadline = deadline or RunDeadline()
+
+    @property
+    def investor(self) -> str:
+        return self.source.investor
+
+    @property
+    def url(self) -> str:
+        return self.source.url
+
+    async def _request(self, entry: CacheEntry | None) -> httpx.Response:
+        LOGGER.debug("Requesting %s page for %s", self.source.SOURCE_NAME, self.investor)
+        headers = dict(self.source.DEFAULT_HEADERS)
+        if entry is not None:
+            headers.update(entry.request_headers())
+        response = await self._send(headers)
+        if response.status_code != 304 or entry is None:
+            response.raise_for_status()
+        return response
+
+    def _timeout(self) -> httpx.Timeout:
+        timeout = self.deadline.clamp(self.source.timeout)
+        if isinstance(timeout, tuple):
+            return httpx.Timeout(timeout[1], connect=timeout[0])
+        return httpx.Timeout(timeout)
+
+    async def _send(self, headers: dict[str, str]) -> httpx.Response:
+        """Asyncio counterpart of :meth:`ThrottledSession.request`."""
+
+        host = host_of(self.url)
+        attempt = 1
+        while True:
+            self.deadline.check()
+            if self.limiter is not None:
+                delay = self.limiter.reserve(host)
+                if delay > 0:
+                    self.deadline.sleep_budget(delay)
+                    await asyncio.sleep(delay)
+            try:
+                response = await self.client.get(self.url, headers=headers, timeout=self._timeout())
+            except httpx.TransportError as exc:
+                if attempt >= self.retry.attempts:
+                    raise
+                retry_after = None
+                LOGGER.warning("Request to %s failed (%s); retrying", host, exc)
+            else:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if self.limiter is not None:
+                    self.limiter.record(host, response.status_code, retry_after)
+                if response.status_code not in self.retry.statuses or attempt >= self.retry.attempts:
+                    return response
+                LOGGER.warning("Request to %s answered %d; retrying", host, response.status_code)
+            delay = self.retry.delay(attempt, retry_after)
+            self.deadline.sleep_budget(delay)
+            attempt += 1
+            LOGGER.debug("Attempt %d for %s in %.1fs", attempt, self.url, delay)
+            await asyncio.sleep(delay)
+
+    async def fetch_page(self) -> Page:
+        # The response cache reads and writes files; keep that off the event loop too.
+        entry = await asyncio.to_thread(self.source._cache_entry)
+        response = await self._request(entry)
+        return await asyncio.to_thread(
+            self.source._page,
+            entry,
+            response.status_code,
+            response.content,
+            response.encoding,
+            response.headers,
+        )
+
+    async def fetch_html(self) -> str:
+        return (await self.fetch_page()).text
+
+    async def fetch_all(self) -> SourceSnapshot:
+        page = await self.fetch_page()
+        # Parsing is CPU bound; keep it off the event loop so the web app stays responsive.
+        return await asyncio.to_thread(self.source.snapshot, page)
+
+    async def fetch_holdings(self) -> List[Holding]:
+        return (await self.fetch_all()).holdings
+
+    async def fetch_deals(self) -> List[Deal]:
+        return (await self.fetch_all()).deals
+
+
+__all__ = ["AsyncInvestorSource"]
@@ -0,0 +1,171 @@
+"""Record-and-replay archive of downloaded investor pages."""
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import tempfile
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Mapping
+
+from .base import Page
+from .cache import body_digest
+
+LOGGER = logging.getLogger(__name__)
+
+LATEST = "latest"
+
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+class PageArchive:
+    """Compressed, content-addressed store of investor pages grouped into runs.
+
+    Page bodies live once under ``objects/<aa>/<sha256>.html.gz`` no matter how many
+    runs reference them. Each recorded run writes ``runs/<run_id>.json`` describing
+    which body every investor received, so a run can later be replayed offline.
+    """
+
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.runs = self.root / "runs"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.runs.mkdir(parents=True, exist_ok=True)
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / f"{digest}.html.gz"
+
+    def put(self, body: bytes) -> str:
+        """Store ``body`` if it is not archived yet and return its digest."""
+
+        digest = body_digest(body)
+        path = self._object_path(digest)
+        if not path.exists():
+            _atomic_write(path, gzip.compress(body))
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        return gzip.decompress(self._object_path(digest).read_bytes())
+
+    def run_ids(self) -> list[str]:
+        """Return recorded run identifiers, oldest first."""
+
+        return sorted(path.stem for path in self.runs.glob("*.json"))
+
+    def record(self, targets: Mapping[str, str], run_id: str | None = None) -> ArchiveRecorder:
+        """Start recording a run over ``targets`` (investor name to URL)."""
+
+        run_id = run_id or datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%fZ")
+        return ArchiveRecorder(self, run_id, targets)
+
+    def replay(self, run_id: str = LATEST) -> ArchiveReplay:
+        """Load a recorded run; ``latest`` selects the most recent one."""
+
+        if run_id == LATEST:
+            recorded = self.run_ids()
+            if not recorded:
+                raise RuntimeError(f"No recorded runs in {self.root}")
+            run_id = recorded[-1]
+        path = self.runs / f"{run_id}.json"
+        if not path.exists():
+            raise RuntimeError(f"Unknown archived run {run_id!r} in {self.root}")
+        return ArchiveReplay(self, json.loads(path.read_text()))
+
+
+class ArchiveRecorder:
+    """Collect the pages of one run and write its manifest on :meth:`close`."""
+
+    def __init__(self, archive: PageArchive, run_id: str, targets: Mapping[str, str]) -> None:
+        self.archive = archive
+        self.run_id = run_id
+        self.targets = dict(targets)
+        self.started_at = datetime.now(timezone.utc)
+        self._pages: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, investor: str, page: Page) -> None:
+        digest = self.archive.put(page.body)
+        entry = {
+            "url": page.url,
+            "sha256": digest,
+            "size": len(page.body),
+            "encoding": page.encoding,
+            "etag": page.etag,
+            "last_modified": page.last_modified,
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            self._pages[investor] = entry
+
+    def fail(self, investor: str, url: str, error: BaseException) -> None:
+        """Remember that ``investor`` could not be fetched so replays fail the same way."""
+
+        with self._lock:
+            self._pages[investor] = {"url": url, "error": f"{type(error).__name__}: {error}"}
+
+    def close(self, **metadata: Any) -> Path:
+        """Write the run manifest, merging any extra ``metadata``."""
+
+        with self._lock:
+            pages = dict(self._pages)
+        manifest = {
+            "run_id": self.run_id,
+            "started_at": self.started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat(),
+            **metadata,
+            "investors": [{"name": name, "url": url} for name, url in self.targets.items()],
+            "pages": pages,
+        }
+        path = self.archive.runs / f"{self.run_id}.json"
+        _atomic_write(path, json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8"))
+        stored = sum("sha256" in entry for entry in pages.values())
+        LOGGER.info(
+            "Archived %d pages (%d failures) as run %s", stored, len(pages) - stored, self.run_id
+        )
+        return path
+
+
+class ArchiveReplay:
+    """Serve the pages of a recorded run in place of the network."""
+
+    def __init__(self, archive: PageArchive, manifest: dict[str, Any]) -> None:
+        self.archive = archive
+        self.manifest = manifest
+        self.run_id: str = manifest["run_id"]
+
+    @property
+    def targets(self) -> dict[str, str]:
+        """Return the run's investors mapped to their URLs, in the recorded order."""
+
+        return {item["name"]: item["url"] for item in self.manifest["investors"]}
+
+    def page(self, investor: str, url: str) -> Page:
+        entry = self.manifest["pages"].get(investor)
+        if entry is None or entry["url"] != url:
+            raise LookupError(f"Run {self.run_id} has no page for {investor} ({url})")
+        if "error" in entry:
+            raise LookupError(f"Run {self.run_id} recorded a failure: {entry['error']}")
+        return Page(
+            url=url,
+            body=self.archive.get(entry["sha256"]),
+            encoding=entry.get("encoding"),
+            etag=entry.get("etag"),
+            last_modified=entry.get("last_modified"),
+        )
+
+
+__all__ = ["ArchiveRecorder", "ArchiveReplay", "LATEST", "PageArchive"]
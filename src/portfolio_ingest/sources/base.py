@@ -1,10 +1,61 @@
 """Base classes for scraping investor data."""
 from __future__ import annotations
 
+import logging
 from abc import ABC, abstractmethod
-from typing import Iterable
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Iterable, List, Mapping, Tuple
+
+import requests
+from bs4 import BeautifulSoup
 
 from ..models import Deal, Holding
+from .parsing import make_soup, resolve_parser
+
+if TYPE_CHECKING:
+    from .cache import CacheEntry, ParseCache, ResponseCache
+    from .transport import Timeout
+
+LOGGER = logging.getLogger(__name__)
+
+# (connect, read) timeouts in seconds.
+REQUEST_TIMEOUT: Tuple[float, float] = (10.0, 30.0)
+
+
+def decode_body(body: bytes, encoding: str | None) -> str:
+    """Decode a page body the same way :attr:`requests.Response.text` does."""
+
+    try:
+        return str(body, encoding or "utf-8", errors="replace")
+    except LookupError:
+        return str(body, errors="replace")
+
+
+def _response_encoding(response: requests.Response) -> str | None:
+    return response.encoding or response.apparent_encoding
+
+
+@dataclass(slots=True)
+class SourceSnapshot:
+    """Holdings and deals parsed from a single download of an investor page."""
+
+    holdings: List[Holding] = field(default_factory=list)
+    deals: List[Deal] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class Page:
+    """Raw body of an investor page, as downloaded or served from a cache or archive."""
+
+    url: str
+    body: bytes
+    encoding: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    @property
+    def text(self) -> str:
+        return decode_body(self.body, self.encoding)
 
 
 class InvestorSource(ABC):
@@ -22,5 +73,201 @@ class InvestorSource(ABC):
     def fetch_deals(self) -> Iterable[Deal]:
         """Yield deals (bulk or block) for the investor."""
 
+    def fetch_all(self) -> SourceSnapshot:
+        """Return holdings and deals together.
+
+        Sources backed by a single page should override this to download and parse the
+        page once; the default simply calls both fetch methods.
+        """
+
+        return SourceSnapshot(holdings=list(self.fetch_holdings()), deals=list(self.fetch_deals()))
+
+
+class PageSource(InvestorSource):
+    """Source whose holdings and deals are scraped from one HTML page.
+
+    Subclasses provide the browser-like request defaults and the table walkers; the
+    download (:meth:`fetch_page`) and the parse (:meth:`snapshot`) are kept separate so
+    the same parsing code can be driven by other transports or by archived pages.
+    """
+
+    SOURCE_NAME = "investor"
+    DEFAULT_HEADERS: Mapping[str, str] = {}
+    DEFAULT_COOKIES: Mapping[str, str] = {}
+    # Tags the table walkers read; everything else is left out of the parse tree.
+    PARSE_ONLY: Tuple[str, ...] = ()
+
+    def __init__(
+        self,
+        investor: str,
+        url: str,
+        session: requests.Session | None = None,
+        cache: ResponseCache | None = None,
+        timeout: Timeout = REQUEST_TIMEOUT,
+        parser: str | None = None,
+        parse_cache: ParseCache | None = None,
+    ) -> None:
+        super().__init__(investor, url)
+        # Pooled sessions are shared between threads and already carry the defaults.
+        self._session = session
+        self.cache = cache
+        self.parse_cache = parse_cache
+        self.timeout = timeout
+        self.parser = resolve_parser(parser)
+
+    @property
+    def session(self) -> requests.Session:
+        """The HTTP session, opened on first use so parse-only sources never build one."""
+
+        if self._session is None:
+            session = requests.Session()
+            # Align the session defaults with a typical browser to avoid bot detection.
+            session.headers.update(self.DEFAULT_HEADERS)
+            session.cookies.update(self.DEFAULT_COOKIES)
+            self._session = session
+        return self._session
+
+    def _cache_entry(self) -> CacheEntry | None:
+        return self.cache.lookup(self.url) if self.cache is not None else None
+
+    def _request(self, entry: CacheEntry | None) -> requests.Response:
+        LOGGER.debug("Requesting %s page for %s", self.SOURCE_NAME, self.investor)
+        headers = entry.request_headers() if entry is not None else None
+        response = self.session.get(self.url, headers=headers, timeout=self.timeout)
+        if response.status_code != 304 or entry is None:
+            response.raise_for_status()
+        return response
+
+    def _page(
+        self,
+        entry: CacheEntry | None,
+        status_code: int,
+        content: bytes,
+        encoding: str | None,
+        headers: Mapping[str, str],
+    ) -> Page:
+        """Build the downloaded page, served from the cache on ``304 Not Modified``.
+
+        Fresh bodies that come with validators are stored in the response cache so the
+        next run can revalidate them.
+        """
+
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if status_code == 304 and entry is not None and self.cache is not None:
+            LOGGER.debug("%s page for %s not modified", self.SOURCE_NAME, self.investor)
+            content, encoding = self.cache.read_body(entry), entry.encoding
+            etag, last_modified = etag or entry.etag, last_modified or entry.last_modified
+            if (etag, last_modified) != (entry.etag, entry.last_modified):
+                self.cache.remember(
+                    self.url, content, encoding=encoding, etag=etag, last_modified=last_modified
+                )
+        elif self.cache is not None and (etag or last_modified):
+            self.cache.remember(
+                self.url, content, encoding=encoding, etag=etag, last_modified=last_modified
+            )
+        return Page(
+            url=self.url,
+            body=content,
+            encoding=encoding,
+            etag=etag,
+            last_modified=last_modified,
+        )
+
+    def fetch_page(self) -> Page:
+        """Download the investor page without parsing it."""
+
+        entry = self._cache_entry()
+        response = self._request(entry)
+        return self._page(
+            entry,
+            response.status_code,
+            response.content,
+            _response_encoding(response),
+            response.headers,
+        )
+
+    def cached_snapshot(self, page: Page) -> SourceSnapshot | None:
+        """Return the earlier parse of a byte-identical page from the parse cache."""
+
+        if self.parse_cache is None:
+            return None
+        snapshot = self.parse_cache.lookup(
+            page.body, self.investor, self.url, self.parser, self.PARSE_ONLY
+        )
+        if snapshot is not None:
+            LOGGER.debug(
+                "%s page for %s unchanged; reusing cached parse", self.SOURCE_NAME, self.investor
+            )
+        return snapshot
+
+    def remember(self, page: Page, snapshot: SourceSnapshot) -> None:
+        """Store the parse of ``page`` in the parse cache, if there is one."""
+
+        if self.parse_cache is not None:
+            self.parse_cache.store(
+                page.body, self.investor, self.url, self.parser, self.PARSE_ONLY, snapshot
+            )
+
+    def snapshot(self, page: Page) -> SourceSnapshot:
+        """Parse ``page``, short-circuiting to the cached snapshot when it is unchanged."""
+
+        snapshot = self.cached_snapshot(page)
+        if snapshot is None:
+            snapshot = self.parse(page.text)
+            self.remember(page, snapshot)
+        return snapshot
+
+    def _fetch_html(self) -> str:
+        return self.fetch_page().text
+
+    def _make_soup(
+        self, html: str, parser: str | None = None, *, strain: bool = True
+    ) -> BeautifulSoup:
+        return make_soup(html, parser or self.parser, self.PARSE_ONLY if strain else ())
+
+    def _get_soup(self) -> BeautifulSoup:
+        return self._make_soup(self._fetch_html())
+
+    def parse(
+        self, html: str, parser: str | None = None, *, strain: bool = True
+    ) -> SourceSnapshot:
+        """Parse an already downloaded page into holdings and deals.
+
+        ``parser`` overrides the source's tree builder for this call and ``strain=False``
+        builds the whole document instead of only :attr:`PARSE_ONLY`, which is how
+        backends and filters are compared against each other.
+        """
+
+        soup = self._make_soup(html, parser, strain=strain)
+        return SourceSnapshot(
+            holdings=list(self._parse_holdings(soup)),
+            deals=list(self._parse_deals(soup)),
+        )
+
+    def fetch_holdings(self) -> Iterable[Holding]:
+        return self._parse_holdings(self._get_soup())
+
+    def fetch_deals(self) -> Iterable[Deal]:
+        return self._parse_deals(self._get_soup())
+
+    def fetch_all(self) -> SourceSnapshot:
+        return self.snapshot(self.fetch_page())
+
+    @abstractmethod
+    def _parse_holdings(self, soup: BeautifulSoup) -> Iterable[Holding]:
+        """Yield holdings found in the parsed page."""
+
+    @abstractmethod
+    def _parse_deals(self, soup: BeautifulSoup) -> Iterable[Deal]:
+        """Yield deals found in the parsed page."""
+
 
-__all__ = ["InvestorSource"]
+__all__ = [
+    "InvestorSource",
+    "Page",
+    "PageSource",
+    "SourceSnapshot",
+    "REQUEST_TIMEOUT",
+    "decode_body",
+]
@@ -0,0 +1,278 @@
+"""On-disk caches for investor pages and their parsed contents."""
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, fields
+from datetime import date
+from pathlib import Path
+from typing import Any, Mapping, Sequence
+
+from ..models import Deal, Holding
+from .base import SourceSnapshot
+
+LOGGER = logging.getLogger(__name__)
+
+CACHE_VERSION = 2
+# Bump when the parsers change in a way that makes stored snapshots stale.
+PARSE_CACHE_VERSION = 1
+# Parsed pages not looked up for this long are pruned when the cache is opened.
+PARSE_CACHE_MAX_AGE = 30 * 24 * 3600
+
+
+def body_digest(body: bytes) -> str:
+    """Return the content hash used to detect unchanged pages."""
+
+    return hashlib.sha256(body).hexdigest()
+
+
+def _encode_snapshot(snapshot: SourceSnapshot) -> dict[str, list[dict[str, Any]]]:
+    def encode(record: Holding | Deal) -> dict[str, Any]:
+        data = {item.name: getattr(record, item.name) for item in fields(record)}
+        return {
+            key: value.isoformat() if isinstance(value, date) else value
+            for key, value in data.items()
+        }
+
+    return {
+        "holdings": [encode(holding) for holding in snapshot.holdings],
+        "deals": [encode(deal) for deal in snapshot.deals],
+    }
+
+
+def _decode_snapshot(data: Mapping[str, list[dict[str, Any]]]) -> SourceSnapshot:
+    holdings = []
+    for item in data["holdings"]:
+        reported = item.get("reported_date")
+        reported_date = date.fromisoformat(reported) if reported else None
+        holdings.append(Holding(**{**item, "reported_date": reported_date}))
+    deals = [
+        Deal(**{**item, "deal_date": date.fromisoformat(item["deal_date"])})
+        for item in data["deals"]
+    ]
+    return SourceSnapshot(holdings=holdings, deals=deals)
+
+
+def _atomic_write(root: Path, path: Path, payload: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=root, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(payload)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+@dataclass(slots=True)
+class CacheEntry:
+    """Validators remembered for a previously fetched URL."""
+
+    url: str
+    encoding: str | None = None
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def request_headers(self) -> dict[str, str]:
+        """Return the conditional request headers for revalidating the page."""
+
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """Store page bodies and their validators on disk, keyed by URL.
+
+    Each URL maps to a JSON metadata file holding the ``ETag``/``Last-Modified``
+    validators and the body's encoding, next to a gzip copy of the body used to answer
+    ``304 Not Modified`` responses. Writes go through a temporary file and
+    :func:`os.replace`, so concurrent fetch workers never see partial files.
+    """
+
+    def __init__(self, root: str | os.PathLike[str]) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _paths(self, url: str) -> tuple[Path, Path]:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return self.root / f"{key}.json", self.root / f"{key}.html.gz"
+
+    def _write(self, path: Path, payload: bytes) -> None:
+        _atomic_write(self.root, path, payload)
+
+    def lookup(self, url: str) -> CacheEntry | None:
+        """Return the cached entry for ``url`` if both metadata and body are present."""
+
+        meta_path, body_path = self._paths(url)
+        if not meta_path.exists() or not body_path.exists():
+            return None
+        try:
+            data = json.loads(meta_path.read_text())
+        except (OSError, ValueError):
+            LOGGER.warning("Ignoring unreadable cache entry for %s", url)
+            return None
+        if data.get("version") != CACHE_VERSION or data.get("url") != url:
+            return None
+        return CacheEntry(
+            url=url,
+            encoding=data.get("encoding"),
+            etag=data.get("etag"),
+            last_modified=data.get("last_modified"),
+        )
+
+    def read_body(self, entry: CacheEntry) -> bytes:
+        _, body_path = self._paths(entry.url)
+        return gzip.decompress(body_path.read_bytes())
+
+    def remember(
+        self,
+        url: str,
+        body: bytes,
+        *,
+        encoding: str | None = None,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> CacheEntry:
+        """Persist the body and validators for ``url``."""
+
+        meta_path, body_path = self._paths(url)
+        entry = CacheEntry(url=url, encoding=encoding, etag=etag, last_modified=last_modified)
+        self._write(body_path, gzip.compress(body))
+        payload = {
+            "version": CACHE_VERSION,
+            "url": url,
+            "encoding": encoding,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        self._write(meta_path, json.dumps(payload).encode("utf-8"))
+        return entry
+
+
+class ParseCache:
+    """Parsed holdings and deals on disk, keyed by the page body and how it was parsed.
+
+    A page whose body is byte-identical to one parsed before skips BeautifulSoup,
+    whether or not the server supports conditional requests. The key also covers the
+    tree builder and the ``parse_only`` element filter, since either can change what
+    the table walkers find. Entries also record the
+    investor and URL they were parsed for, since those are stamped on every row.
+    Lookups and misses are counted so each run can report its hit rate.
+    """
+
+    def __init__(
+        self, root: str | os.PathLike[str], max_age: float = PARSE_CACHE_MAX_AGE
+    ) -> None:
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.prune(max_age)
+
+    def _path(self, body: bytes, parser: str, parse_only: Sequence[str]) -> Path:
+        key = hashlib.sha256(body)
+        key.update(f"\0{parser}\0{','.join(parse_only)}".encode("utf-8"))
+        return self.root / f"{key.hexdigest()}.json"
+
+    def prune(self, max_age: float) -> int:
+        """Delete entries not used within ``max_age`` seconds and return how many."""
+
+        cutoff = time.time() - max_age
+        removed = 0
+        for path in self.root.glob("*.json"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        if removed:
+            LOGGER.debug("Pruned %d stale parsed pages from %s", removed, self.root)
+        return removed
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def lookup(
+        self,
+        body: bytes,
+        investor: str,
+        url: str,
+        parser: str,
+        parse_only: Sequence[str] = (),
+    ) -> SourceSnapshot | None:
+        """Return the stored parse of ``body`` for ``investor``, counting the hit or miss."""
+
+        path = self._path(body, parser, parse_only)
+        try:
+            data = json.loads(path.read_text())
+        except FileNotFoundError:
+            data = None
+        except (OSError, ValueError):
+            LOGGER.warning("Ignoring unreadable parse cache entry %s", path.name)
+            data = None
+        if (
+            data is None
+            or data.get("version") != PARSE_CACHE_VERSION
+            or data.get("investor") != investor
+            or data.get("url") != url
+        ):
+            self._count(False)
+            return None
+        self._count(True)
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return _decode_snapshot(data["snapshot"])
+
+    def store(
+        self,
+        body: bytes,
+        investor: str,
+        url: str,
+        parser: str,
+        parse_only: Sequence[str],
+        snapshot: SourceSnapshot,
+    ) -> None:
+        """Remember ``snapshot`` as the parse of ``body`` for ``investor``."""
+
+        payload = {
+            "version": PARSE_CACHE_VERSION,
+            "investor": investor,
+            "url": url,
+            "snapshot": _encode_snapshot(snapshot),
+        }
+        path = self._path(body, parser, parse_only)
+        _atomic_write(self.root, path, json.dumps(payload).encode("utf-8"))
+
+    def log_stats(self) -> None:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        if hits or misses:
+            LOGGER.info("Parse cache: %d hits, %d misses", hits, misses)
+
+
+__all__ = [
+    "CACHE_VERSION",
+    "PARSE_CACHE_VERSION",
+    "CacheEntry",
+    "ParseCache",
+    "ResponseCache",
+    "body_digest",
+]
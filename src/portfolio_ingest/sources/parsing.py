@@ -0,0 +1,87 @@
+"""HTML parser backend selection for the page sources."""
+from __future__ import annotations
+
+import logging
+from functools import lru_cache
+from typing import TYPE_CHECKING, Iterable, Sequence
+
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.builder import builder_registry
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .base import Page, PageSource, SourceSnapshot
+
+LOGGER = logging.getLogger(__name__)
+
+# Fastest first; html.parser ships with Python and is always available.
+PARSER_PREFERENCE: tuple[str, ...] = ("lxml", "html.parser")
+FALLBACK_PARSER = "html.parser"
+# Builders that honour ``parse_only``; html5lib always builds the full tree.
+STRAINING_PARSERS = frozenset({"lxml", "html.parser"})
+
+
+def available_parsers(candidates: Iterable[str] = PARSER_PREFERENCE) -> list[str]:
+    """Return the BeautifulSoup tree builders from ``candidates`` that are installed."""
+
+    return [name for name in candidates if builder_registry.lookup(name) is not None]
+
+
+@lru_cache(maxsize=None)
+def resolve_parser(preferred: str | None = None) -> str:
+    """Pick the tree builder to use, falling back to ``html.parser``.
+
+    ``preferred`` may name any builder BeautifulSoup knows about (``lxml``,
+    ``html.parser``, ``html5lib``); when it is missing or not installed the fastest
+    available backend from :data:`PARSER_PREFERENCE` is used instead.
+    """
+
+    if preferred:
+        if builder_registry.lookup(preferred) is not None:
+            return preferred
+        LOGGER.warning("HTML parser %r is not installed; falling back", preferred)
+    installed = available_parsers()
+    return installed[0] if installed else FALLBACK_PARSER
+
+
+def make_soup(markup: str | bytes, parser: str, parse_only: Sequence[str] = ()) -> BeautifulSoup:
+    """Parse ``markup`` with ``parser``, keeping only the ``parse_only`` elements.
+
+    Restricting the tree to the tags a source reads (and their descendants) skips
+    building nodes for scripts, navigation and footers, which dominate the pages.
+    """
+
+    if parse_only and parser in STRAINING_PARSERS:
+        return BeautifulSoup(markup, parser, parse_only=SoupStrainer(list(parse_only)))
+    return BeautifulSoup(markup, parser)
+
+
+def compare_parsers(
+    source: PageSource, page: Page, parsers: Sequence[str] | None = None
+) -> dict[str, SourceSnapshot]:
+    """Parse ``page`` with every backend and return the snapshots that differ.
+
+    The reference is the full, unfiltered document parsed by :data:`FALLBACK_PARSER`.
+    Every other backend is checked with and without the strainer, and the fallback
+    with it. The result maps each differing parse, labelled ``"<backend>"`` or
+    ``"<backend> (strained)"``, to its snapshot.
+    """
+
+    html = page.text
+    reference = source.parse(html, parser=FALLBACK_PARSER, strain=False)
+    snapshots: dict[str, SourceSnapshot] = {}
+    for name in parsers or available_parsers():
+        if name != FALLBACK_PARSER:
+            snapshots[name] = source.parse(html, parser=name, strain=False)
+        snapshots[f"{name} (strained)"] = source.parse(html, parser=name)
+    return {label: snapshot for label, snapshot in snapshots.items() if snapshot != reference}
+
+
+__all__ = [
+    "FALLBACK_PARSER",
+    "PARSER_PREFERENCE",
+    "STRAINING_PARSERS",
+    "available_parsers",
+    "compare_parsers",
+    "make_soup",
+    "resolve_parser",
+]
@@ -4,12 +4,12 @@ from __future__ import annotations
 import logging
 from typing import Iterable
 
-import requests
 from bs4 import BeautifulSoup
 
 from ..models import Deal, Holding
-from .base import InvestorSource
-from .utils import parse_date, parse_float, parse_int
+from .base import PageSource
+from .tables import Column, extract_table, header_texts
+from .utils import parse_date_column, parse_float_column, parse_int_column
 
 LOGGER = logging.getLogger(__name__)
 
@@ -34,58 +34,62 @@ DEFAULT_COOKIES = {
     "sessionid": "butv6umn556lxo50fe8uppju66dzcexb",
 }
 
+HOLDING_COLUMNS = (
+    Column("company", 0, ("company",), link=True),
+    Column("percent", 1, ("holding",)),
+    Column("shares", 2, ("shares", "qty", "quantity")),
+    Column("date", 3, ("date",)),
+)
 
-class ScreenerSource(InvestorSource):
+DEAL_COLUMNS = (
+    Column("company", 0, ("company", "stock"), link=True),
+    Column("date", 1, ("date",)),
+    Column("side", 2, ("action", "side", "buy/sell", "transaction")),
+    Column("quantity", 3, ("quantity", "qty", "shares")),
+    Column("price", 4, ("price",)),
+)
+
+
+class ScreenerSource(PageSource):
     """Scraper for screener.in investor pages."""
 
     BASE_URL = "https://www.screener.in"
 
-    def __init__(self, investor: str, url: str, session: requests.Session | None = None) -> None:
-        super().__init__(investor, url)
-        self.session = session or requests.Session()
-        # Align the session defaults with a typical browser to avoid bot detection.
-        self.session.headers.update(DEFAULT_HEADERS)
-        self.session.cookies.update(DEFAULT_COOKIES)
-
-    def _get_soup(self) -> BeautifulSoup:
-        LOGGER.debug("Requesting Screener page for %s", self.investor)
-        response = self.session.get(self.url, timeout=30)
-        response.raise_for_status()
-        return BeautifulSoup(response.text, "html.parser")
-
-    def fetch_holdings(self) -> Iterable[Holding]:
-        soup = self._get_soup()
+    SOURCE_NAME = "Screener"
+    DEFAULT_HEADERS = DEFAULT_HEADERS
+    DEFAULT_COOKIES = DEFAULT_COOKIES
+    # Holdings live in tables; deal tables follow their ``<h2>`` headings.
+    PARSE_ONLY = ("table", "h2")
+
+    def _parse_holdings(self, soup: BeautifulSoup) -> Iterable[Holding]:
         LOGGER.debug("Parsing holdings table for %s", self.investor)
         tables = soup.find_all("table")
         for table in tables:
-            header = [th.get_text(strip=True).lower() for th in table.find_all("th")]
+            header = header_texts(table)
             if "company" in header and ("holding" in " ".join(header) or "shares" in header):
-                for row in table.find_all("tr"):
-                    cells = row.find_all("td")
-                    if not cells:
-                        continue
-                    company_cell = cells[0]
-                    anchor = company_cell.find("a", href=True)
-                    if not anchor or "/company/" not in anchor["href"]:
-                        continue
-                    ticker = anchor["href"].strip("/").split("/")[-1]
-                    percent = parse_float(cells[1].get_text(strip=True) if len(cells) > 1 else None)
-                    shares = parse_int(cells[2].get_text(strip=True) if len(cells) > 2 else None)
-                    reported = None
-                    if len(cells) > 3:
-                        reported = parse_date(cells[3].get_text(strip=True))
+                columns = extract_table(table, HOLDING_COLUMNS)
+                anchors = columns.links["company"]
+                rows = [
+                    row
+                    for row, anchor in enumerate(anchors)
+                    if anchor and "/company/" in anchor["href"]
+                ]
+                percents = parse_float_column(columns.take("percent", rows))
+                shares = parse_int_column(columns.take("shares", rows))
+                dates = parse_date_column(columns.take("date", rows))
+                for row, percent, count, reported in zip(rows, percents, shares, dates):
+                    ticker = anchors[row]["href"].strip("/").split("/")[-1]
                     yield Holding(
                         investor=self.investor,
                         ticker=ticker.upper(),
                         source_url=self.url,
                         percent_holding=percent,
-                        shares=shares,
+                        shares=count,
                         reported_date=reported,
                     )
                 break
 
-    def fetch_deals(self) -> Iterable[Deal]:
-        soup = self._get_soup()
+    def _parse_deals(self, soup: BeautifulSoup) -> Iterable[Deal]:
         LOGGER.debug("Parsing deals tables for %s", self.investor)
         for title in soup.find_all("h2"):
             heading = title.get_text(strip=True).lower()
@@ -94,25 +98,23 @@ class ScreenerSource(InvestorSource):
                 if not table:
                     continue
                 deal_type = "bulk" if "bulk" in heading else "block"
-                for row in table.find_all("tr"):
-                    cells = row.find_all("td")
-                    if not cells:
-                        continue
-                    anchor = cells[0].find("a", href=True)
-                    if not anchor:
-                        continue
-                    ticker = anchor.get_text(strip=True).upper()
-                    deal_date = parse_date(cells[1].get_text(strip=True) if len(cells) > 1 else None)
-                    side_text = cells[2].get_text(strip=True).lower() if len(cells) > 2 else ""
-                    if side_text not in {"buy", "sell"}:
-                        continue
-                    if deal_date is None:
-                        continue
-                    quantity = parse_int(cells[3].get_text(strip=True) if len(cells) > 3 else None)
-                    price = parse_float(cells[4].get_text(strip=True) if len(cells) > 4 else None)
+                columns = extract_table(table, DEAL_COLUMNS)
+                anchors = columns.links["company"]
+                rows = [row for row, anchor in enumerate(anchors) if anchor]
+                dates = parse_date_column(columns.take("date", rows))
+                sides = [(text or "").lower() for text in columns.take("side", rows)]
+                kept = [
+                    (row, deal_date, side_text)
+                    for row, deal_date, side_text in zip(rows, dates, sides)
+                    if side_text in {"buy", "sell"} and deal_date is not None
+                ]
+                rows = [row for row, _, _ in kept]
+                quantities = parse_int_column(columns.take("quantity", rows))
+                prices = parse_float_column(columns.take("price", rows))
+                for (row, deal_date, side_text), quantity, price in zip(kept, quantities, prices):
                     yield Deal(
                         investor=self.investor,
-                        ticker=ticker,
+                        ticker=anchors[row].get_text(strip=True).upper(),
                         source_url=self.url,
                         deal_date=deal_date,
                         quantity=quantity,
@@ -0,0 +1,158 @@
+"""Single-pass, column-oriented extraction of HTML tables."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence
+
+from bs4 import Tag
+
+
+@dataclass(frozen=True, slots=True)
+class Column:
+    """A column a table walker reads.
+
+    ``keywords`` are matched against the lower-cased text of the table's last header row
+    to find the column; ``position`` is used when no header cell, or more than one,
+    matches. ``link`` also captures the first ``<a href>`` in each cell.
+    """
+
+    name: str
+    position: int
+    keywords: tuple[str, ...] = ()
+    link: bool = False
+
+
+@dataclass(slots=True)
+class ColumnarTable:
+    """Cell text of a table's data rows, stored column by column."""
+
+    header: List[str]
+    indices: Dict[str, int]
+    values: Dict[str, List[str | None]] = field(default_factory=dict)
+    links: Dict[str, List[Tag | None]] = field(default_factory=dict)
+    rows: int = 0
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __getitem__(self, name: str) -> List[str | None]:
+        return self.values[name]
+
+    def take(self, name: str, rows: Sequence[int]) -> List[str | None]:
+        """Return the text of column ``name`` for the selected ``rows`` only."""
+
+        values = self.values[name]
+        return [values[row] for row in rows]
+
+
+def header_texts(table: Tag) -> List[str]:
+    """Return the stripped, lower-cased text of every ``<th>`` in ``table``."""
+
+    return [th.get_text(strip=True).lower() for th in table.find_all("th")]
+
+
+def _span(cell: Tag, attribute: str) -> int:
+    try:
+        return max(1, int(cell.get(attribute, 1)))
+    except (TypeError, ValueError):
+        return 1
+
+
+def header_row(table: Tag) -> List[str]:
+    """Return the lower-cased header text of each data column of ``table``.
+
+    Only the last header row (a row of ``<th>`` without ``<td>``) is used, so group
+    headings above it are ignored. ``colspan`` repeats a cell's text for every column it
+    covers and ``rowspan`` carries it down from earlier header rows, so position ``i``
+    lines up with the ``i``-th ``<td>`` of the data rows.
+    """
+
+    last: Dict[int, str] = {}
+    spans: Dict[int, tuple[int, str]] = {}
+    for row in table.find_all("tr"):
+        cells = row.find_all(["th", "td"], recursive=False)
+        if not cells or any(cell.name == "td" for cell in cells):
+            continue
+        texts: Dict[int, str] = {}
+        carried: Dict[int, tuple[int, str]] = {}
+        for position, (rows, text) in spans.items():
+            texts[position] = text
+            if rows > 1:
+                carried[position] = (rows - 1, text)
+        position = 0
+        for cell in cells:
+            while position in texts:
+                position += 1
+            text = cell.get_text(strip=True).lower()
+            rows = _span(cell, "rowspan")
+            for _ in range(_span(cell, "colspan")):
+                texts[position] = text
+                if rows > 1:
+                    carried[position] = (rows - 1, text)
+                position += 1
+        last, spans = texts, carried
+    return [last.get(position, "") for position in range(max(last, default=-1) + 1)]
+
+
+def resolve_columns(header: Sequence[str], columns: Sequence[Column]) -> Dict[str, int]:
+    """Map each column name to its cell index.
+
+    A column takes the one header cell containing one of its keywords that no earlier
+    column has claimed. When no cell matches, or several do, it keeps its default
+    position.
+    """
+
+    indices: Dict[str, int] = {}
+    claimed: set[int] = set()
+    for column in columns:
+        matches = [
+            position
+            for position, text in enumerate(header)
+            if position not in claimed and any(keyword in text for keyword in column.keywords)
+        ]
+        index = matches[0] if len(matches) == 1 else column.position
+        indices[column.name] = index
+        claimed.add(index)
+    return indices
+
+
+def extract_table(
+    table: Tag, columns: Sequence[Column], header: Sequence[str] | None = None
+) -> ColumnarTable:
+    """Walk the data rows of ``table`` once, collecting the text of each column.
+
+    Columns are resolved against ``header``, by default the table's :func:`header_row`.
+    Rows without ``<td>`` cells (header rows) are skipped. Cells missing from short rows
+    are ``None``.
+    """
+
+    header = list(header_row(table) if header is None else header)
+    indices = resolve_columns(header, columns)
+    result = ColumnarTable(header=header, indices=indices)
+    wanted = [(column.name, indices[column.name]) for column in columns]
+    values = {name: [] for name, _ in wanted}
+    linked = [(column.name, indices[column.name]) for column in columns if column.link]
+    links: Dict[str, List[Tag | None]] = {name: [] for name, _ in linked}
+    for row in table.find_all("tr"):
+        cells = row.find_all("td", recursive=False)
+        if not cells:
+            continue
+        count = len(cells)
+        for name, index in wanted:
+            values[name].append(cells[index].get_text(strip=True) if index < count else None)
+        for name, index in linked:
+            links[name].append(cells[index].find("a", href=True) if index < count else None)
+        result.rows += 1
+    result.values = values
+    result.links = links
+    return result
+
+
+__all__ = [
+    "Column",
+    "ColumnarTable",
+    "extract_table",
+    "header_row",
+    "header_texts",
+    "resolve_columns",
+]
@@ -0,0 +1,130 @@
+"""Adaptive per-host request rate limiting."""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+LOGGER = logging.getLogger(__name__)
+
+THROTTLE_STATUSES = frozenset({429, 503})
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Return the delay in seconds requested by a ``Retry-After`` header."""
+
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass(slots=True)
+class _Bucket:
+    rate: float
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+
+
+class HostRateLimiter:
+    """Token bucket per host with additive-increase/multiplicative-decrease pacing.
+
+    Every host starts at ``rate`` requests per second. A throttling response (429/503)
+    halves that host's rate and, when the server sends ``Retry-After``, pauses the host
+    until the requested time. Each healthy response adds ``rate * increase`` back, up
+    to ``max_rate``, so throughput climbs back towards what the host tolerates.
+
+    :meth:`reserve` never sleeps itself; it books a slot and returns how long the caller
+    must wait, which lets threaded and asyncio callers share one limiter. After a
+    ``Retry-After`` pause the bucket restarts empty at the end of the pause.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        max_rate: float | None = None,
+        min_rate: float = 0.1,
+        burst: float = 1.0,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.initial_rate = rate
+        self.max_rate = max(rate, max_rate or rate)
+        self.min_rate = min(rate, min_rate)
+        self.burst = burst
+        self.step = rate * increase
+        self.decrease = decrease
+        self._buckets: dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str, now: float) -> _Bucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _Bucket(self.initial_rate, self.burst, now)
+        return bucket
+
+    def rate(self, host: str) -> float:
+        """Return the current request rate for ``host``."""
+
+        with self._lock:
+            return self._bucket(host, time.monotonic()).rate
+
+    def reserve(self, host: str) -> float:
+        """Take a token for ``host`` and return the seconds to wait before sending."""
+
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            if bucket.blocked_until > bucket.updated:
+                # Resume from an empty bucket once the block lifts, so requests queued
+                # behind Retry-After are spaced at the reduced rate rather than released
+                # together.
+                bucket.tokens = 0.0
+                bucket.updated = bucket.blocked_until
+            if now > bucket.updated:
+                bucket.tokens = min(
+                    self.burst, bucket.tokens + (now - bucket.updated) * bucket.rate
+                )
+                bucket.updated = now
+            bucket.tokens -= 1.0
+            wait = -bucket.tokens / bucket.rate if bucket.tokens < 0 else 0.0
+            return bucket.updated - now + wait
+
+    def record(self, host: str, status_code: int, retry_after: float | None = None) -> None:
+        """Adapt the host's pacing to the outcome of a request."""
+
+        with self._lock:
+            now = time.monotonic()
+            bucket = self._bucket(host, now)
+            if status_code in THROTTLE_STATUSES:
+                bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+                bucket.tokens = min(bucket.tokens, 0.0)
+                if retry_after:
+                    bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+                LOGGER.warning(
+                    "%s answered %d; slowing to %.2f req/s%s",
+                    host,
+                    status_code,
+                    bucket.rate,
+                    f" for at least {retry_after:.0f}s" if retry_after else "",
+                )
+            elif status_code < 400 and bucket.rate < self.max_rate:
+                bucket.rate = min(self.max_rate, bucket.rate + self.step)
+
+
+__all__ = ["HostRateLimiter", "THROTTLE_STATUSES", "parse_retry_after"]
@@ -0,0 +1,230 @@
+"""Shared HTTP plumbing for the synchronous sources."""
+from __future__ import annotations
+
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Mapping, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .throttle import HostRateLimiter, parse_retry_after
+
+LOGGER = logging.getLogger(__name__)
+
+
+def host_of(url: str) -> str:
+    """Return the lower-cased network location of ``url``."""
+
+    return urlsplit(url).netloc.lower()
+
+
+Timeout = Union[float, Tuple[float, float]]
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRYABLE_ERRORS = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+
+
+class DeadlineExceeded(RuntimeError):
+    """Raised when a request cannot complete before the run deadline."""
+
+
+class RunDeadline:
+    """Wall-clock budget shared by every request of an ingestion run."""
+
+    def __init__(self, seconds: float | None = None) -> None:
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds if seconds else None
+
+    def remaining(self) -> float | None:
+        """Return the seconds left, or ``None`` for an unbounded run."""
+
+        if self.expires_at is None:
+            return None
+        return self.expires_at - time.monotonic()
+
+    def check(self) -> None:
+        remaining = self.remaining()
+        if remaining is not None and remaining <= 0:
+            raise DeadlineExceeded(f"Run deadline of {self.seconds:.0f}s exceeded")
+
+    def clamp(self, timeout: Timeout | None) -> Timeout | None:
+        """Shrink ``timeout`` so a request cannot outlive the deadline."""
+
+        remaining = self.remaining()
+        if remaining is None:
+            return timeout
+        remaining = max(remaining, 0.001)
+        if timeout is None:
+            return remaining
+        if isinstance(timeout, tuple):
+            return (min(timeout[0], remaining), min(timeout[1], remaining))
+        return min(timeout, remaining)
+
+    def sleep_budget(self, delay: float) -> None:
+        """Fail fast when waiting ``delay`` seconds would overrun the deadline."""
+
+        remaining = self.remaining()
+        if remaining is not None and delay >= remaining:
+            raise DeadlineExceeded(
+                f"Backing off {delay:.1f}s would exceed the run deadline of {self.seconds:.0f}s"
+            )
+
+
+@dataclass(frozen=True, slots=True)
+class RetryPolicy:
+    """Exponential backoff with full jitter for transient request failures.
+
+    ``attempts`` counts every try, so ``attempts=1`` sends each request once.
+    """
+
+    attempts: int = 3
+    backoff: float = 1.0
+    max_backoff: float = 30.0
+    statuses: frozenset[int] = RETRYABLE_STATUSES
+
+    def delay(self, attempt: int, retry_after: float | None = None) -> float:
+        """Return the pause before retry number ``attempt`` (1-based)."""
+
+        ceiling = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return max(random.uniform(0, ceiling), retry_after or 0.0)
+
+
+class ThrottledSession(requests.Session):
+    """Session that paces, retries and time-boxes every request it sends.
+
+    Requests are paced through the optional :class:`HostRateLimiter`. Connection
+    errors, timeouts and retryable statuses (429/5xx) are retried according to the
+    :class:`RetryPolicy`, honouring ``Retry-After``. Timeouts and backoff sleeps are
+    clamped to the optional :class:`RunDeadline` so a slow host cannot stretch the run.
+    """
+
+    def __init__(
+        self,
+        limiter: HostRateLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        deadline: RunDeadline | None = None,
+    ) -> None:
+        super().__init__()
+        self.limiter = limiter
+        self.retry = retry or RetryPolicy()
+        self.deadline = deadline or RunDeadline()
+
+    def request(self, method: str, url: str, *args: Any, **kwargs: Any) -> requests.Response:
+        host = host_of(url)
+        attempt = 1
+        while True:
+            self.deadline.check()
+            if self.limiter is not None:
+                delay = self.limiter.reserve(host)
+                if delay > 0:
+                    self.deadline.sleep_budget(delay)
+                    time.sleep(delay)
+            kwargs["timeout"] = self.deadline.clamp(kwargs.get("timeout"))
+            try:
+                response = super().request(method, url, *args, **kwargs)
+            except RETRYABLE_ERRORS as exc:
+                if attempt >= self.retry.attempts:
+                    raise
+                retry_after = None
+                LOGGER.warning("Request to %s failed (%s); retrying", host, exc)
+            else:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if self.limiter is not None:
+                    self.limiter.record(host, response.status_code, retry_after)
+                if response.status_code not in self.retry.statuses or attempt >= self.retry.attempts:
+                    return response
+                LOGGER.warning("Request to %s answered %d; retrying", host, response.status_code)
+                response.close()
+            delay = self.retry.delay(attempt, retry_after)
+            self.deadline.sleep_budget(delay)
+            attempt += 1
+            LOGGER.debug("Attempt %d for %s in %.1fs", attempt, url, delay)
+            time.sleep(delay)
+
+
+class SessionRegistry:
+    """Hand out one keep-alive :class:`requests.Session` per host.
+
+    Every investor page on the same host reuses the session's connection pool, so a
+    run pays the TCP/TLS handshake once per pooled connection rather than once per
+    investor. The registry is thread safe and should be closed when the run finishes.
+    The sessions pace, retry and time-box their requests as described on
+    :class:`ThrottledSession`.
+    """
+
+    def __init__(
+        self,
+        pool_connections: int = 4,
+        pool_maxsize: int = 10,
+        limiter: HostRateLimiter | None = None,
+        retry: RetryPolicy | None = None,
+        deadline: RunDeadline | None = None,
+    ) -> None:
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.limiter = limiter
+        self.retry = retry
+        self.deadline = deadline
+        self._sessions: dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def _build_session(
+        self, headers: Mapping[str, str] | None, cookies: Mapping[str, str] | None
+    ) -> requests.Session:
+        session = ThrottledSession(self.limiter, self.retry, self.deadline)
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(headers or {})
+        session.cookies.update(cookies or {})
+        return session
+
+    def session_for(
+        self,
+        url: str,
+        headers: Mapping[str, str] | None = None,
+        cookies: Mapping[str, str] | None = None,
+    ) -> requests.Session:
+        """Return the pooled session for the host serving ``url``.
+
+        ``headers`` and ``cookies`` are the host's request defaults. They are applied
+        once, when the session is opened; sessions already shared between fetch threads
+        are never modified, and cookies the server refreshes are kept.
+        """
+
+        host = host_of(url)
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                LOGGER.debug("Opening pooled HTTP session for %s", host)
+                session = self._sessions[host] = self._build_session(headers, cookies)
+        return session
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+    def __enter__(self) -> "SessionRegistry":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+__all__ = [
+    "DeadlineExceeded",
+    "RetryPolicy",
+    "RunDeadline",
+    "SessionRegistry",
+    "ThrottledSession",
+    "Timeout",
+    "host_of",
+]
@@ -4,12 +4,12 @@ from __future__ import annotations
 import logging
 from typing import Iterable
 
-import requests
 from bs4 import BeautifulSoup
 
 from ..models import Deal, Holding
-from .base import InvestorSource
-from .utils import parse_date, parse_float, parse_int
+from .base import PageSource
+from .tables import Column, extract_table, header_texts
+from .utils import parse_date_column, parse_float_column, parse_int_column
 
 LOGGER = logging.getLogger(__name__)
 
@@ -42,53 +42,59 @@ DEFAULT_COOKIES = {
     "_ga_7F29Q8ZGH0": "GS2.1.s1762888100$o35$g1$t1762888622$j60$l0$h0",
 }
 
+HOLDING_COLUMNS = (
+    Column("stock", 0, ("stock", "company"), link=True),
+    Column("percent", 1, ("holding",)),
+    Column("shares", 2, ("qty", "quantity", "shares")),
+    Column("date", 3, ("date",)),
+)
+
+DEAL_COLUMNS = (
+    Column("stock", 0, ("stock", "company")),
+    Column("date", 1, ("date",)),
+    Column("side", 2, ("action", "side", "buy/sell", "transaction")),
+    Column("quantity", 3, ("quantity", "qty", "shares")),
+    Column("price", 4, ("price",)),
+)
 
-class TrendlyneSource(InvestorSource):
-    """Scraper for Trendlyne superstar pages."""
 
-    def __init__(self, investor: str, url: str, session: requests.Session | None = None) -> None:
-        super().__init__(investor, url)
-        self.session = session or requests.Session()
-        # Update the session with headers/cookies required to avoid bot detection.
-        self.session.headers.update(DEFAULT_HEADERS)
-        self.session.cookies.update(DEFAULT_COOKIES)
+class TrendlyneSource(PageSource):
+    """Scraper for Trendlyne superstar pages."""
 
-    def _get_soup(self) -> BeautifulSoup:
-        LOGGER.debug("Requesting Trendlyne page for %s", self.investor)
-        response = self.session.get(self.url, timeout=30)
-        response.raise_for_status()
-        return BeautifulSoup(response.text, "html.parser")
+    SOURCE_NAME = "Trendlyne"
+    DEFAULT_HEADERS = DEFAULT_HEADERS
+    DEFAULT_COOKIES = DEFAULT_COOKIES
+    # Deal tables sit inside ``<section>`` blocks; the holdings table may not.
+    PARSE_ONLY = ("section", "table")
 
-    def fetch_holdings(self) -> Iterable[Holding]:
-        soup = self._get_soup()
+    def _parse_holdings(self, soup: BeautifulSoup) -> Iterable[Holding]:
         LOGGER.debug("Parsing holdings table for %s", self.investor)
         tables = soup.select("table")
         for table in tables:
-            header = [th.get_text(strip=True).lower() for th in table.find_all("th")]
+            header = header_texts(table)
             if not header:
                 continue
             if "stock" in header[0] or "company" in header[0]:
-                for row in table.find_all("tr"):
-                    cells = row.find_all("td")
-                    if not cells:
-                        continue
-                    anchor = cells[0].find("a", href=True)
-                    ticker = (anchor.get_text(strip=True) if anchor else cells[0].get_text(strip=True)).upper()
-                    percent = parse_float(cells[1].get_text(strip=True) if len(cells) > 1 else None)
-                    shares = parse_int(cells[2].get_text(strip=True) if len(cells) > 2 else None)
-                    reported = parse_date(cells[3].get_text(strip=True) if len(cells) > 3 else None)
+                columns = extract_table(table, HOLDING_COLUMNS)
+                tickers = [
+                    (anchor.get_text(strip=True) if anchor else text).upper()
+                    for anchor, text in zip(columns.links["stock"], columns["stock"])
+                ]
+                percents = parse_float_column(columns["percent"])
+                shares = parse_int_column(columns["shares"])
+                dates = parse_date_column(columns["date"])
+                for ticker, percent, count, reported in zip(tickers, percents, shares, dates):
                     yield Holding(
                         investor=self.investor,
                         ticker=ticker,
                         source_url=self.url,
                         percent_holding=percent,
-                        shares=shares,
+                        shares=count,
                         reported_date=reported,
                     )
                 break
 
-    def fetch_deals(self) -> Iterable[Deal]:
-        soup = self._get_soup()
+    def _parse_deals(self, soup: BeautifulSoup) -> Iterable[Deal]:
         LOGGER.debug("Parsing deals sections for %s", self.investor)
         for section in soup.find_all("section"):
             title = section.find(["h2", "h3"])
@@ -101,26 +107,26 @@ class TrendlyneSource(InvestorSource):
             if not table:
                 continue
             deal_type = "bulk" if "bulk" in heading else "block"
-            for row in table.find_all("tr"):
-                cells = row.find_all("td")
-                if not cells:
-                    continue
-                ticker = cells[0].get_text(strip=True).upper()
-                deal_date = parse_date(cells[1].get_text(strip=True) if len(cells) > 1 else None)
-                side_text = cells[2].get_text(strip=True).lower() if len(cells) > 2 else ""
-                if side_text not in {"buy", "sell"} or deal_date is None:
-                    continue
-                quantity = parse_int(cells[3].get_text(strip=True) if len(cells) > 3 else None)
-                price = parse_float(cells[4].get_text(strip=True) if len(cells) > 4 else None)
+            columns = extract_table(table, DEAL_COLUMNS)
+            dates = parse_date_column(columns["date"])
+            sides = [(text or "").lower() for text in columns["side"]]
+            rows = [
+                row
+                for row, (deal_date, side_text) in enumerate(zip(dates, sides))
+                if side_text in {"buy", "sell"} and deal_date is not None
+            ]
+            quantities = parse_int_column(columns.take("quantity", rows))
+            prices = parse_float_column(columns.take("price", rows))
+            for row, quantity, price in zip(rows, quantities, prices):
                 yield Deal(
                     investor=self.investor,
-                    ticker=ticker,
+                    ticker=(columns["stock"][row] or "").upper(),
                     source_url=self.url,
-                    deal_date=deal_date,
+                    deal_date=dates[row],
                     quantity=quantity,
                     price=price,
                     deal_type=deal_type,
-                    side=side_text,
+                    side=sides[row],
                 )
 
 
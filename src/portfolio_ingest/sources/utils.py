@@ -2,13 +2,67 @@
 from __future__ import annotations
 
 import re
-from datetime import date
-from typing import Optional
+from datetime import date, datetime
+from functools import lru_cache
+from math import copysign, floor, isfinite
+from typing import Iterable, List, Optional, Sequence
 
 from dateutil import parser
 
 
 NON_DIGIT = re.compile(r"[^0-9.]")
+# First number in a cell, with Indian or western digit grouping ("1,23,456.5").
+NUMBER = re.compile(r"\d[\d,]*(?:\.\d+)?|\.\d+")
+# Unit written right after the number: "1.2 Cr", "35 L", "4.5 lakh".
+UNIT = re.compile(r"\s*(crores?|cr|lakhs?|lacs?|lkh|l)\b\.?", re.IGNORECASE)
+UNIT_SCALE = {"c": 10_000_000, "l": 100_000}
+# Text allowed before a negative number: a minus sign or an opening parenthesis, with an
+# optional currency marker on either side ("-1,200", "Rs. -1,200", "(₹1.2 Cr)").
+CURRENCY = r"(?:\u20b9|rs\.?|inr|\$)"
+MINUS_PREFIX = re.compile(rf"\s*(?:{CURRENCY}\s*)?[-\u2212]\s*(?:{CURRENCY}\s*)?", re.IGNORECASE)
+PAREN_PREFIX = re.compile(rf"\s*(?:{CURRENCY}\s*)?\(\s*(?:{CURRENCY}\s*)?", re.IGNORECASE)
+PAREN_SUFFIX = re.compile(r"\s*%?\s*\)")
+
+# Layouts parsed with ``strptime`` before falling back to dateutil. Each one yields the
+# date ``dateutil`` picks with ``dayfirst=True``; year-first and two-digit-year dates are
+# left to dateutil, which reads ``2024-04-01`` day-first as 4 January.
+DATE_FORMATS = (
+    "%d %b %Y",
+    "%d %B %Y",
+    "%d %b, %Y",
+    "%b %d, %Y",
+    "%B %d, %Y",
+    "%d-%b-%Y",
+    "%d-%m-%Y",
+    "%d/%m/%Y",
+    "%d.%m.%Y",
+)
+
+
+def _number(value: str) -> Optional[float]:
+    """Parse one numeric cell: separators, units, currency and negatives included."""
+
+    match = NUMBER.search(value)
+    if match is None:
+        return None
+    number = float(match.group().replace(",", ""))
+    end = match.end()
+    unit = UNIT.match(value, end)
+    if unit is not None:
+        number *= UNIT_SCALE[unit.group(1).lower()[0]]
+        end = unit.end()
+    prefix = value[: match.start()]
+    if MINUS_PREFIX.fullmatch(prefix) or (
+        PAREN_PREFIX.fullmatch(prefix) and PAREN_SUFFIX.match(value, end)
+    ):
+        number = -number
+    return number
+
+
+def _round(number: float) -> int:
+    """Round half away from zero, so "12.5" gives 13 rather than Python's 12."""
+
+    return int(copysign(floor(abs(number) + 0.5), number))
 
 
 def parse_float(value: str | None) -> Optional[float]:
@@ -16,12 +70,11 @@ def parse_float(value: str | None) -> Optional[float]:
 
     if not value:
         return None
-    cleaned = value.strip().replace("%", "")
     try:
-        return float(cleaned)
+        number = float(value.replace(",", "").replace("%", ""))
     except ValueError:
-        cleaned = NON_DIGIT.sub("", cleaned)
-        return float(cleaned) if cleaned else None
+        return _number(value)
+    return number if isfinite(number) else _number(value)
 
 
 def parse_int(value: str | None) -> Optional[int]:
@@ -29,16 +82,99 @@ def parse_int(value: str | None) -> Optional[int]:
 
     if not value:
         return None
-    cleaned = re.sub(r"[^0-9]", "", value)
-    return int(cleaned) if cleaned else None
+    try:
+        return int(value.replace(",", ""))
+    except ValueError:
+        number = parse_float(value)
+    return _round(number) if number is not None else None
+
+
+def parse_float_column(values: Sequence[str | None]) -> List[Optional[float]]:
+    """Parse a column of numbers in one call.
+
+    Columns of plain numbers are converted in a single comprehension; when any cell
+    needs the unit or sign rules the column falls back to per-cell parsing, with each
+    distinct text parsed once.
+    """
+
+    try:
+        numbers = [float(value.replace(",", "").rstrip("%")) if value else None for value in values]
+    except ValueError:
+        pass
+    else:
+        if all(number is None or isfinite(number) for number in numbers):
+            return numbers
+    parsed = {value: parse_float(value) for value in set(values) if value}
+    return [parsed[value] if value else None for value in values]
+
+
+def parse_int_column(values: Sequence[str | None]) -> List[Optional[int]]:
+    """Integer counterpart of :func:`parse_float_column`."""
+
+    try:
+        return [int(value.replace(",", "")) if value else None for value in values]
+    except ValueError:
+        pass
+    parsed = {value: parse_int(value) for value in set(values) if value}
+    return [parsed[value] if value else None for value in values]
+
+
+def _strptime(value: str, fmt: str) -> Optional[date]:
+    try:
+        return datetime.strptime(value, fmt).date()
+    except ValueError:
+        return None
+
+
+def sniff_date_format(values: Iterable[str | None]) -> Optional[str]:
+    """Return the :data:`DATE_FORMATS` entry matching the first non-empty value."""
+
+    for value in values:
+        if value:
+            return next((fmt for fmt in DATE_FORMATS if _strptime(value, fmt)), None)
+    return None
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(value: str) -> date:
+    for fmt in DATE_FORMATS:
+        parsed = _strptime(value, fmt)
+        if parsed is not None:
+            return parsed
+    return parser.parse(value, dayfirst=True).date()
 
 
 def parse_date(value: str | None) -> Optional[date]:
-    """Parse a date string using dateutil."""
+    """Parse a date string, trying the known layouts before dateutil."""
 
     if not value:
         return None
-    return parser.parse(value, dayfirst=True).date()
+    return _parse_date(value)
+
+
+def parse_date_column(values: Sequence[str | None]) -> List[Optional[date]]:
+    """Parse a column of dates, sniffing the layout once from its first value."""
+
+    fmt = sniff_date_format(values)
+    parsed: dict[str, Optional[date]] = {}
+    dates: List[Optional[date]] = []
+    for value in values:
+        if not value:
+            dates.append(None)
+            continue
+        if value not in parsed:
+            hit = _strptime(value, fmt) if fmt is not None else None
+            parsed[value] = hit if hit is not None else _parse_date(value)
+        dates.append(parsed[value])
+    return dates
 
 
-__all__ = ["parse_float", "parse_int", "parse_date"]
+__all__ = [
+    "parse_date",
+    "parse_date_column",
+    "parse_float",
+    "parse_float_column",
+    "parse_int",
+    "parse_int_column",
+    "sniff_date_format",
+]
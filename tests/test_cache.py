@@ -0,0 +1,37 @@
+"""On-disk response and parse caches."""
+from __future__ import annotations
+
+from pathlib import Path
+
+from portfolio_ingest.models import Holding
+from portfolio_ingest.sources import ParseCache, ResponseCache, SourceSnapshot
+
+URL = "https://www.screener.in/people/12345/investor/"
+BODY = b"<table><tr><td>ABC</td></tr></table>"
+SNAPSHOT = SourceSnapshot(
+    holdings=[Holding(investor="Investor", ticker="ABC", source_url=URL, percent_holding=1.5)],
+    deals=[],
+)
+
+
+def test_parse_cache_hits_only_the_same_parser_and_filter(tmp_path: Path) -> None:
+    cache = ParseCache(tmp_path)
+    cache.store(BODY, "Investor", URL, "lxml", ("table", "h2"), SNAPSHOT)
+    assert cache.lookup(BODY, "Investor", URL, "lxml", ("table", "h2")) == SNAPSHOT
+    assert cache.lookup(BODY, "Investor", URL, "html.parser", ("table", "h2")) is None
+    assert cache.lookup(BODY, "Investor", URL, "lxml", ("table",)) is None
+    assert cache.lookup(BODY, "Investor", URL, "lxml") is None
+    assert cache.lookup(BODY + b" ", "Investor", URL, "lxml", ("table", "h2")) is None
+    assert cache.lookup(BODY, "Someone else", URL, "lxml", ("table", "h2")) is None
+    assert (cache.hits, cache.misses) == (1, 5)
+
+
+def test_response_cache_round_trips_validators_and_body(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path)
+    assert cache.lookup(URL) is None
+    cache.remember(URL, BODY, encoding="utf-8", etag='"v1"')
+    entry = cache.lookup(URL)
+    assert entry is not None
+    assert entry.request_headers() == {"If-None-Match": '"v1"'}
+    assert cache.read_body(entry) == BODY
+    assert entry.encoding == "utf-8"
@@ -0,0 +1,73 @@
+"""Saved investor pages must parse the same with every backend and strainer."""
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+
+import pytest
+
+from portfolio_ingest.sources import Page, SourceSnapshot, compare_parsers, create_source
+
+PAGES = Path(__file__).parent / "fixtures" / "pages"
+FIXTURES = sorted(PAGES.glob("*.html"), key=lambda path: path.name)
+URLS = {
+    "screener": "https://www.screener.in/people/12345/investor/",
+    "trendlyne": "https://trendlyne.com/portfolio/superstar-shareholders/12345/investor/",
+}
+PARSERS = ("html.parser", "lxml")
+
+
+def _source(path: Path):
+    return create_source("Investor", URLS[path.stem.split("_")[0]])
+
+
+def _rows(snapshot: SourceSnapshot) -> dict[str, list[dict[str, object]]]:
+    """Return ``snapshot`` as plain JSON values, the layout of the ``.json`` fixtures."""
+
+    rows = {
+        "holdings": [asdict(holding) for holding in snapshot.holdings],
+        "deals": [asdict(deal) for deal in snapshot.deals],
+    }
+    return json.loads(json.dumps(rows, default=str))
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda path: path.stem)
+def test_reference_parse_matches_expected_rows(path: Path) -> None:
+    snapshot = _source(path).parse(path.read_text(encoding="utf-8"), "html.parser", strain=False)
+    expected = json.loads(path.with_suffix(".json").read_text(encoding="utf-8"))
+    assert _rows(snapshot) == expected
+
+
+@pytest.mark.parametrize("strain", [True, False], ids=["strained", "full"])
+@pytest.mark.parametrize("parser", PARSERS)
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda path: path.stem)
+def test_backends_and_strainers_agree(path: Path, parser: str, strain: bool) -> None:
+    source = _source(path)
+    html = path.read_text(encoding="utf-8")
+    reference = source.parse(html, "html.parser", strain=False)
+    assert source.parse(html, parser, strain=strain) == reference
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=lambda path: path.stem)
+def test_compare_parsers_reports_no_differences(path: Path) -> None:
+    source = _source(path)
+    page = Page(url=source.url, body=path.read_bytes(), encoding="utf-8")
+    assert compare_parsers(source, page, PARSERS) == {}
+
+
+def test_compare_parsers_reports_a_diverging_strained_parse(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    path = PAGES / "screener_standard.html"
+    source = _source(path)
+    page = Page(url=source.url, body=path.read_bytes(), encoding="utf-8")
+    parse = source.parse
+
+    def lossy_strainer(html: str, parser: str | None = None, strain: bool = True):
+        if strain and parser == "lxml":
+            return SourceSnapshot([], [])
+        return parse(html, parser, strain=strain)
+
+    monkeypatch.setattr(source, "parse", lossy_strainer)
+    assert list(compare_parsers(source, page, PARSERS)) == ["lxml (strained)"]
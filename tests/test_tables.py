@@ -0,0 +1,63 @@
+"""Header resolution of the column-oriented table walker."""
+from __future__ import annotations
+
+from bs4 import BeautifulSoup
+
+from portfolio_ingest.sources.tables import Column, extract_table, header_row, resolve_columns
+
+COLUMNS = (
+    Column("company", 0, ("company",)),
+    Column("percent", 1, ("holding",)),
+    Column("shares", 2, ("shares", "qty")),
+)
+
+
+def _table(html: str):
+    return BeautifulSoup(f"<table>{html}</table>", "html.parser").table
+
+
+def test_header_row_uses_the_last_header_row_with_spans_expanded() -> None:
+    table = _table(
+        "<tr><th rowspan='2'>Company</th><th colspan='2'>Position</th><th>As of</th></tr>"
+        "<tr><th>Qty</th><th>Holding %</th><th>Date</th></tr>"
+        "<tr><td>A</td><td>10</td><td>1%</td><td>1 Jan 2024</td></tr>"
+    )
+    assert header_row(table) == ["company", "qty", "holding %", "date"]
+
+
+def test_header_row_repeats_colspan_text() -> None:
+    table = _table("<tr><th>Company</th><th colspan='2'>Holding</th></tr>")
+    assert header_row(table) == ["company", "holding", "holding"]
+
+
+def test_header_row_ignores_data_rows_and_headerless_tables() -> None:
+    assert header_row(_table("<tr><td>A</td><td>B</td></tr>")) == []
+    table = _table("<tr><th>Company</th></tr><tr><td>A</td></tr><tr><th>Total</th></tr>")
+    assert header_row(table) == ["total"]
+
+
+def test_resolve_columns_follows_unique_keyword_matches() -> None:
+    header = ["shares", "company", "holding %"]
+    assert resolve_columns(header, COLUMNS) == {"company": 1, "percent": 2, "shares": 0}
+
+
+def test_resolve_columns_falls_back_to_position_on_ambiguous_keywords() -> None:
+    header = ["company", "holding", "holding"]
+    assert resolve_columns(header, COLUMNS) == {"company": 0, "percent": 1, "shares": 2}
+
+
+def test_resolve_columns_falls_back_to_position_without_a_header() -> None:
+    assert resolve_columns([], COLUMNS) == {"company": 0, "percent": 1, "shares": 2}
+
+
+def test_extract_table_reads_cells_under_a_grouped_header() -> None:
+    table = _table(
+        "<tr><th rowspan='2'>Company</th><th colspan='2'>Holding</th></tr>"
+        "<tr><th>Shares</th><th>Holding %</th></tr>"
+        "<tr><td>A</td><td>100</td><td>2%</td></tr>"
+        "<tr><td>B</td><td>200</td></tr>"
+    )
+    columns = extract_table(table, COLUMNS)
+    assert columns.indices == {"company": 0, "percent": 2, "shares": 1}
+    assert columns["percent"] == ["2%", None]
+    assert columns["shares"] == ["100", "200"]
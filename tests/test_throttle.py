@@ -0,0 +1,118 @@
+"""Per-host token buckets pace requests and adapt to throttling responses."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import pytest
+
+from portfolio_ingest.sources import HostRateLimiter, throttle
+from portfolio_ingest.sources.throttle import parse_retry_after
+
+HOST = "www.screener.in"
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(throttle, "time", SimpleNamespace(monotonic=clock))
+    return clock
+
+
+def test_reservations_are_spaced_at_the_rate(clock: Clock) -> None:
+    limiter = HostRateLimiter(2.0)
+    assert limiter.reserve(HOST) == 0.0
+    assert limiter.reserve(HOST) == pytest.approx(0.5)
+    assert limiter.reserve(HOST) == pytest.approx(1.0)
+
+
+def test_bucket_refills_up_to_burst(clock: Clock) -> None:
+    limiter = HostRateLimiter(2.0, burst=2.0)
+    assert limiter.reserve(HOST) == 0.0
+    assert limiter.reserve(HOST) == 0.0
+    assert limiter.reserve(HOST) == pytest.approx(0.5)
+    clock.now += 10.0
+    assert [limiter.reserve(HOST) for _ in range(3)] == pytest.approx([0.0, 0.0, 0.5])
+
+
+def test_hosts_are_paced_independently(clock: Clock) -> None:
+    limiter = HostRateLimiter(1.0)
+    assert limiter.reserve(HOST) == 0.0
+    assert limiter.reserve("trendlyne.com") == 0.0
+    assert limiter.reserve(HOST) == pytest.approx(1.0)
+
+
+def test_throttling_halves_the_rate_down_to_the_floor(clock: Clock) -> None:
+    limiter = HostRateLimiter(4.0, min_rate=1.5)
+    limiter.record(HOST, 429)
+    assert limiter.rate(HOST) == pytest.approx(2.0)
+    limiter.record(HOST, 503)
+    assert limiter.rate(HOST) == pytest.approx(1.5)
+
+
+def test_healthy_responses_raise_the_rate_up_to_the_ceiling(clock: Clock) -> None:
+    limiter = HostRateLimiter(2.0, max_rate=2.5, increase=0.1)
+    limiter.record(HOST, 429)
+    limiter.record(HOST, 200)
+    assert limiter.rate(HOST) == pytest.approx(1.2)
+    for _ in range(20):
+        limiter.record(HOST, 304)
+    assert limiter.rate(HOST) == pytest.approx(2.5)
+
+
+def test_client_errors_leave_the_rate_alone(clock: Clock) -> None:
+    limiter = HostRateLimiter(2.0, max_rate=4.0)
+    limiter.record(HOST, 404)
+    assert limiter.rate(HOST) == pytest.approx(2.0)
+
+
+def test_retry_after_blocks_then_spaces_at_the_reduced_rate(clock: Clock) -> None:
+    limiter = HostRateLimiter(2.0)
+    assert limiter.reserve(HOST) == 0.0
+    limiter.record(HOST, 429, retry_after=10.0)
+    # The rate halves to 1 req/s and the bucket restarts empty when the block lifts.
+    waits = [limiter.reserve(HOST) for _ in range(3)]
+    assert waits == pytest.approx([11.0, 12.0, 13.0])
+    clock.now += 12.0
+    assert limiter.reserve(HOST) == pytest.approx(2.0)
+
+
+def test_retry_after_does_not_shorten_an_existing_block(clock: Clock) -> None:
+    limiter = HostRateLimiter(1.0)
+    limiter.record(HOST, 503, retry_after=30.0)
+    limiter.record(HOST, 503, retry_after=5.0)
+    assert limiter.reserve(HOST) == pytest.approx(30.0 + 1 / limiter.rate(HOST))
+
+
+def test_rate_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        HostRateLimiter(0)
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"), [("120", 120.0), (" 7 ", 7.0), ("0", 0.0), (None, None), ("", None)]
+)
+def test_parse_retry_after_seconds(value: str | None, expected: float | None) -> None:
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date() -> None:
+    when = datetime.now(timezone.utc) + timedelta(seconds=120)
+    assert parse_retry_after(format_datetime(when, usegmt=True)) == pytest.approx(120, abs=2)
+
+
+def test_parse_retry_after_past_date_is_zero() -> None:
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_parse_retry_after_rejects_garbage() -> None:
+    assert parse_retry_after("soon") is None
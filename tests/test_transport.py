@@ -0,0 +1,172 @@
+"""Retry, backoff and deadline handling of the shared HTTP transport."""
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+import requests
+from requests.adapters import BaseAdapter
+
+from portfolio_ingest.config import Settings
+from portfolio_ingest.sources import transport
+from portfolio_ingest.sources.transport import (
+    DeadlineExceeded,
+    RetryPolicy,
+    RunDeadline,
+    ThrottledSession,
+)
+
+URL = "https://www.screener.in/people/12345/investor/"
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.slept: list[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    fake_time = SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep)
+    monkeypatch.setattr(transport, "time", fake_time)
+    return clock
+
+
+class ScriptedAdapter(BaseAdapter):
+    """Answer each request with the next status code or exception in ``script``."""
+
+    def __init__(
+        self, script: list[int | Exception], headers: dict[str, str] | None = None
+    ) -> None:
+        super().__init__()
+        self.script = list(script)
+        self.headers = headers or {}
+        self.sent = 0
+
+    def send(self, request: requests.PreparedRequest, **kwargs: object) -> requests.Response:
+        self.sent += 1
+        outcome = self.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        response = requests.Response()
+        response.status_code = outcome
+        response.headers.update(self.headers)
+        response.url = request.url or ""
+        response.request = request
+        response._content = b""
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def _session(adapter: ScriptedAdapter, attempts: int = 3, **kwargs: object) -> ThrottledSession:
+    session = ThrottledSession(retry=RetryPolicy(attempts=attempts, backoff=0.5), **kwargs)
+    session.mount("https://", adapter)
+    return session
+
+
+def test_backoff_grows_exponentially_up_to_the_cap(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(transport.random, "uniform", lambda low, high: high)
+    policy = RetryPolicy(backoff=1.0, max_backoff=5.0)
+    assert [policy.delay(attempt) for attempt in range(1, 6)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+
+def test_backoff_is_jittered_below_the_ceiling() -> None:
+    policy = RetryPolicy(backoff=2.0)
+    assert all(0.0 <= policy.delay(2) <= 4.0 for _ in range(100))
+
+
+def test_backoff_honours_retry_after(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(transport.random, "uniform", lambda low, high: low)
+    assert RetryPolicy().delay(1, retry_after=7.0) == 7.0
+
+
+def test_unbounded_deadline_leaves_timeouts_alone() -> None:
+    deadline = RunDeadline()
+    deadline.check()
+    assert deadline.clamp((10.0, 30.0)) == (10.0, 30.0)
+    assert deadline.clamp(None) is None
+
+
+def test_deadline_clamps_timeouts_to_the_remaining_budget(clock: Clock) -> None:
+    deadline = RunDeadline(20.0)
+    clock.now += 15.0
+    assert deadline.clamp((10.0, 30.0)) == (5.0, 5.0)
+    assert deadline.clamp(2.0) == 2.0
+    assert deadline.clamp(None) == 5.0
+
+
+def test_expired_deadline_fails_checks_and_backoff(clock: Clock) -> None:
+    deadline = RunDeadline(20.0)
+    with pytest.raises(DeadlineExceeded):
+        deadline.sleep_budget(25.0)
+    clock.now += 20.0
+    with pytest.raises(DeadlineExceeded):
+        deadline.check()
+    assert deadline.clamp(10.0) == pytest.approx(0.001)
+
+
+@pytest.mark.parametrize("status", [429, 500, 502, 503, 504])
+def test_retryable_statuses_are_retried(clock: Clock, status: int) -> None:
+    adapter = ScriptedAdapter([status, status, 200])
+    response = _session(adapter).get(URL)
+    assert response.status_code == 200
+    assert adapter.sent == 3
+    assert len(clock.slept) == 2
+
+
+@pytest.mark.parametrize("status", [400, 403, 404])
+def test_client_errors_fail_fast(clock: Clock, status: int) -> None:
+    adapter = ScriptedAdapter([status, 200])
+    assert _session(adapter).get(URL).status_code == status
+    assert adapter.sent == 1
+    assert clock.slept == []
+
+
+def test_last_retryable_response_is_returned_when_attempts_run_out(clock: Clock) -> None:
+    adapter = ScriptedAdapter([503, 503, 503, 200])
+    assert _session(adapter).get(URL).status_code == 503
+    assert adapter.sent == 3
+
+
+def test_connection_errors_are_retried_then_raised(clock: Clock) -> None:
+    adapter = ScriptedAdapter([requests.ConnectionError("reset")] * 2)
+    with pytest.raises(requests.ConnectionError):
+        _session(adapter, attempts=2).get(URL)
+    assert adapter.sent == 2
+
+
+def test_single_attempt_never_retries(clock: Clock) -> None:
+    adapter = ScriptedAdapter([503, 200])
+    assert _session(adapter, attempts=1).get(URL).status_code == 503
+    assert adapter.sent == 1
+
+
+def test_retry_after_sets_the_backoff(clock: Clock) -> None:
+    adapter = ScriptedAdapter([429, 200], headers={"Retry-After": "12"})
+    assert _session(adapter).get(URL).status_code == 200
+    assert clock.slept == [12.0]
+
+
+def test_backoff_past_the_deadline_fails_fast(clock: Clock) -> None:
+    adapter = ScriptedAdapter([429, 200], headers={"Retry-After": "60"})
+    with pytest.raises(DeadlineExceeded):
+        _session(adapter, deadline=RunDeadline(30.0)).get(URL)
+    assert adapter.sent == 1
+
+
+def test_http_retries_setting_counts_retries() -> None:
+    env = {"PORTFOLIO_INGEST_DATABASE_URL": "postgresql+psycopg://localhost/portfolio"}
+    assert Settings.load(env).http_retries == 2
+    assert Settings.load({**env, "PORTFOLIO_INGEST_HTTP_RETRIES": "0"}).http_retries == 0
+    with pytest.raises(RuntimeError):
+        Settings.load({**env, "PORTFOLIO_INGEST_HTTP_RETRIES": "-1"})
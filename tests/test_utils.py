@@ -0,0 +1,150 @@
+"""Cell parsers shared by the page sources."""
+from __future__ import annotations
+
+import pytest
+from dateutil import parser
+
+from portfolio_ingest.sources.utils import (
+    DATE_FORMATS,
+    parse_date,
+    parse_date_column,
+    parse_float,
+    parse_float_column,
+    parse_int,
+    parse_int_column,
+    sniff_date_format,
+)
+
+
+def _dateutil(value: str):
+    return parser.parse(value, dayfirst=True).date()
+
+
+DATES = [
+    "31 Mar 2024",
+    "5 March 2024",
+    "05 Mar, 2024",
+    "Mar 5, 2024",
+    "March 05, 2024",
+    "05-Mar-2024",
+    "13-04-2024",
+    "13/04/2024",
+    "13.04.2024",
+    # Ambiguous day/month layouts must stay day-first.
+    "01-02-2024",
+    "01/02/2024",
+    "01.02.2024",
+    "12/11/2023",
+    # Left to dateutil.
+    "2024-04-01",
+    "1/2/24",
+    "1 Mar 24",
+]
+
+
+@pytest.mark.parametrize("value", DATES)
+def test_parse_date_matches_dateutil_dayfirst(value: str) -> None:
+    assert parse_date(value) == _dateutil(value)
+
+
+def test_every_fast_path_format_is_covered() -> None:
+    assert {sniff_date_format([value]) for value in DATES} >= set(DATE_FORMATS)
+
+
+@pytest.mark.parametrize(
+    "column",
+    [
+        pytest.param(["01/02/2024", "02/03/2024", "", None, "01/02/2024"], id="uniform"),
+        pytest.param(["31 Mar 2024", "01/04/2024", "Apr 2, 2024", "2024-04-01"], id="mixed"),
+        pytest.param(["01/02/2024", "02/03/2024", "13-04-2024", "5 May 2024"], id="sniff-fails"),
+        pytest.param([None, "2024-04-01", "01/02/2024"], id="sniff-falls-back"),
+        pytest.param(["12/11/2023", "11/12/2023", "12.11.2023"], id="ambiguous"),
+    ],
+)
+def test_parse_date_column_matches_dateutil_dayfirst(column: list[str | None]) -> None:
+    expected = [_dateutil(value) if value else None for value in column]
+    assert parse_date_column(column) == expected
+    assert parse_date_column(column) == [parse_date(value) for value in column]
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1,23,456", 123456.0),
+        ("1.2 Cr", 12_000_000.0),
+        ("1.2 crores", 12_000_000.0),
+        ("35 L", 3_500_000.0),
+        ("4.5 lakh", 450_000.0),
+        ("5.2 Lacs.", 520_000.0),
+        ("Rs 1,00,000", 100_000.0),
+        ("1e3", 1000.0),
+        ("-", None),
+        ("n/a", None),
+        ("", None),
+        (None, None),
+    ],
+)
+def test_parse_float_scales_units(value: str | None, expected: float | None) -> None:
+    assert parse_float(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("-1,200", -1200.0),
+        ("\u22121,200", -1200.0),
+        ("- 1200", -1200.0),
+        ("\u20b9-1,200", -1200.0),
+        ("-\u20b91,200", -1200.0),
+        ("Rs. -500", -500.0),
+        ("(1,200)", -1200.0),
+        ("(\u20b91.2 Cr)", -12_000_000.0),
+        ("(2.5%)", -2.5),
+        ("-0.35 lakh", -35_000.0),
+        # A dash or parenthesis elsewhere in the cell is not a sign.
+        ("Buy - 1200", 1200.0),
+        ("Sold (1,200 shares)", 1200.0),
+        ("1,200 (approx.)", 1200.0),
+    ],
+)
+def test_parse_float_negatives(value: str, expected: float) -> None:
+    assert parse_float(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("12.5%", 12.5), ("7.36%", 7.36), ("100%", 100.0), ("(2.5%)", -2.5), ("- %", None)],
+)
+def test_parse_float_strips_percent_signs(value: str, expected: float | None) -> None:
+    assert parse_float(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1,200", 1200),
+        ("1e3", 1000),
+        ("1.2 Cr", 12_000_000),
+        ("12.5%", 13),
+        ("2.5", 3),
+        ("-2.5", -3),
+        ("(0.5)", -1),
+        ("2.49", 2),
+        ("Buy - 1200", 1200),
+        ("nan", None),
+        ("inf", None),
+    ],
+)
+def test_parse_int_parses_like_parse_float_and_rounds_half_away_from_zero(
+    value: str, expected: int | None
+) -> None:
+    assert parse_int(value) == expected
+
+
+def test_numeric_columns_match_the_cell_parsers() -> None:
+    cells = ["1,200", "12.5%", "1.2 Cr", "(1,200)", "Buy - 1200", "1e3", "", None]
+    assert parse_float_column(cells) == [parse_float(cell) for cell in cells]
+    assert parse_int_column(cells) == [parse_int(cell) for cell in cells]
+    plain = ["1,200", "12.5", None]
+    assert parse_float_column(plain) == [1200.0, 12.5, None]
+    assert parse_int_column(["1,200", "", None]) == [1200, None, None]